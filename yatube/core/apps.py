@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from . import instrumentation, slow_queries, sqlite
+
+        instrumentation.install()
+        slow_queries.install()
+        sqlite.install()
@@ -0,0 +1,48 @@
+# core/decorators.py
+from contextlib import ExitStack
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from .replica import used_databases
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(limit):
+    """Ограничивает число SQL-запросов, которые может выполнить view.
+
+    Лимит сохраняется в атрибуте query_budget, а при
+    settings.QUERY_BUDGET_ENFORCE превышение лимита поднимает
+    QueryBudgetExceeded.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not settings.QUERY_BUDGET_ENFORCE:
+                return view(request, *args, **kwargs)
+            # Запросы считаются по всем базам, включая реплику
+            with ExitStack() as stack:
+                captured = [
+                    stack.enter_context(
+                        CaptureQueriesContext(connections[alias])
+                    )
+                    for alias in used_databases()
+                ]
+                response = view(request, *args, **kwargs)
+            queries = sum(len(queries) for queries in captured)
+            if queries > limit:
+                raise QueryBudgetExceeded(
+                    f'{view.__name__}: {queries} SQL-запросов '
+                    f'при лимите {limit}'
+                )
+            return response
+
+        wrapper.query_budget = limit
+        return wrapper
+
+    return decorator
@@ -0,0 +1,169 @@
+# core/instrumentation.py
+import threading
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+from time import perf_counter
+
+from django.db import connections
+from django.template import base
+from django.template.backends.django import Template
+
+from .replica import used_databases
+
+_state = threading.local()
+
+
+class Measurement:
+    """Затраты одного запроса: SQL, отрисовка шаблонов и общее время.
+
+    render_time не включает SQL, выполненный из шаблонов (ленивые
+    queryset'ы), — он учтён в sql_time. С trace=True дополнительно
+    сохраняются все SQL-запросы (statements) и отрисовки каждого
+    шаблона, включая вложенные (template_trace). Запрос в statements —
+    (sql, params, many, время, псевдоним базы).
+    """
+
+    def __init__(self, trace=False):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+        self.templates = []
+        self.statements = [] if trace else None
+        self.template_trace = [] if trace else None
+
+
+def explain(sql, params, using='default'):
+    """План выполнения SELECT-запроса; для прочих запросов пусто.
+
+    EXPLAIN идёт через курсор драйвера, минуя execute_wrapper и
+    connection.queries, чтобы не попадать в замеры и лимиты запросов.
+    """
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return []
+    connection = connections[using]
+    connection.ensure_connection()
+    cursor = connection.create_cursor()
+    try:
+        cursor.execute(
+            f'{connection.ops.explain_query_prefix()} {sql}', params
+        )
+        return [str(row[-1]) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def current_view():
+    """Имя view запроса, который обрабатывает текущий поток."""
+    return getattr(_state, 'view', None)
+
+
+def set_current_view(name):
+    _state.view = name
+
+
+def active_measurements():
+    """Открытые блоки measure текущего потока, от внешнего к внутреннему."""
+    if not hasattr(_state, 'measurements'):
+        _state.measurements = []
+    return _state.measurements
+
+
+def timed_render(render):
+    @wraps(render)
+    def wrapper(self, context=None, request=None):
+        measurements = active_measurements()
+        # Вложенные отрисовки (render_to_string из тегов) уже входят
+        # во время внешнего шаблона
+        if not measurements or getattr(_state, 'rendering', False):
+            return render(self, context, request)
+        _state.rendering = True
+        sql_times = [measurement.sql_time for measurement in measurements]
+        started = perf_counter()
+        try:
+            return render(self, context, request)
+        finally:
+            elapsed = perf_counter() - started
+            _state.rendering = False
+            for measurement, sql_time in zip(measurements, sql_times):
+                spent = elapsed - (measurement.sql_time - sql_time)
+                measurement.render_time += spent
+                measurement.templates.append(
+                    (self.origin.template_name, spent)
+                )
+
+    wrapper.timed = True
+    return wrapper
+
+
+def traced_render(render):
+    @wraps(render)
+    def wrapper(self, context):
+        tracing = [
+            measurement for measurement in active_measurements()
+            if measurement.template_trace is not None
+        ]
+        if not tracing:
+            return render(self, context)
+        # Запись добавляется до отрисовки, чтобы шаблоны шли в порядке
+        # начала, а вложенные — после содержащего их
+        depth = getattr(_state, 'depth', 0)
+        entry = [self.origin.template_name or self.name, depth, 0.0]
+        for measurement in tracing:
+            measurement.template_trace.append(entry)
+        _state.depth = depth + 1
+        started = perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            entry[2] = perf_counter() - started
+            _state.depth = depth
+
+    wrapper.timed = True
+    return wrapper
+
+
+def install():
+    """Подключает учёт времени отрисовки шаблонов Django."""
+    if not getattr(Template.render, 'timed', False):
+        Template.render = timed_render(Template.render)
+    if not getattr(base.Template.render, 'timed', False):
+        base.Template.render = traced_render(base.Template.render)
+
+
+@contextmanager
+def measure(using=None, trace=False):
+    """Замеряет SQL и шаблоны кода внутри блока.
+
+    Работает и без DEBUG: запросы считаются через execute_wrapper
+    соединения using, а по умолчанию — всех баз, включая реплику.
+    """
+    measurement = Measurement(trace)
+
+    def count_query(execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - started
+            measurement.queries += 1
+            measurement.sql_time += elapsed
+            if measurement.statements is not None:
+                measurement.statements.append((
+                    sql, params, many, elapsed, context['connection'].alias
+                ))
+
+    measurements = active_measurements()
+    measurements.append(measurement)
+    started = perf_counter()
+    aliases = [using] if using else used_databases()
+    try:
+        with ExitStack() as stack:
+            for alias in aliases:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(count_query)
+                )
+            yield measurement
+    finally:
+        measurement.total_time = perf_counter() - started
+        measurements.remove(measurement)
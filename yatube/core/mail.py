@@ -0,0 +1,156 @@
+# core/mail.py
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+# На сколько секунд send_outbox откладывает взятые письма: если процесс
+# упадёт посреди отправки, их возьмёт следующий
+CLAIM_TIMEOUT = 5 * 60
+
+
+def dump_message(message):
+    """Письмо в JSON для очереди; вложения не поддерживаются."""
+    if message.attachments:
+        raise ValueError('Письма с вложениями нельзя поставить в очередь')
+    return json.dumps({
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'alternatives': getattr(message, 'alternatives', []),
+    }, ensure_ascii=False)
+
+
+def load_message(payload, connection=None):
+    data = json.loads(payload)
+    alternatives = [tuple(item) for item in data.pop('alternatives')]
+    return EmailMultiAlternatives(
+        alternatives=alternatives, connection=connection, **data
+    )
+
+
+class OutboxBackend(BaseEmailBackend):
+    """Ставит письма в очередь вместо отправки.
+
+    Запрос только записывает строки OutboxMessage; отправляет их через
+    OUTBOX_EMAIL_BACKEND команда send_outbox.
+    """
+
+    def send_messages(self, email_messages):
+        OutboxMessage.objects.bulk_create(
+            OutboxMessage(payload=dump_message(message))
+            for message in email_messages
+        )
+        return len(email_messages)
+
+
+def claim_batch(size):
+    """Берёт письма, которым пора уходить, и откладывает их.
+
+    Отложенные на CLAIM_TIMEOUT письма не достанутся другому
+    процессу send_outbox, пока этот их отправляет.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.filter(
+                status=OutboxMessage.PENDING, next_attempt_at__lte=now
+            ).order_by('next_attempt_at')[:size]
+        )
+        OutboxMessage.objects.filter(
+            pk__in=[message.pk for message in messages]
+        ).update(next_attempt_at=now + timedelta(seconds=CLAIM_TIMEOUT))
+    return messages
+
+
+def send_chunk(messages):
+    """Отправляет письма одним соединением бэкенда.
+
+    Выполняется в потоке пула и не обращается к базе; возвращает
+    ошибку для каждого письма или None, если оно ушло. Если соединение
+    не открылось (сервер недоступен), ошибку получает каждое письмо
+    пачки, и они уходят на повтор по общим правилам.
+    """
+    connection = get_connection(settings.OUTBOX_EMAIL_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        return [describe(error)] * len(messages)
+    errors = []
+    try:
+        for message in messages:
+            try:
+                load_message(message.payload, connection).send()
+            except Exception as error:
+                errors.append(describe(error))
+            else:
+                errors.append(None)
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            # Письма к этому моменту уже приняты сервером; ошибка при
+            # закрытии не повод отправлять их ещё раз
+            pass
+    return errors
+
+
+def describe(error):
+    return f'{type(error).__name__}: {error}'
+
+
+def record_results(messages, errors):
+    now = timezone.now()
+    for message, error in zip(messages, errors):
+        message.attempts += 1
+        if error is None:
+            message.status = OutboxMessage.SENT
+            message.sent_at = now
+            message.last_error = ''
+        else:
+            message.last_error = error
+            if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                message.status = OutboxMessage.FAILED
+            else:
+                delay = settings.OUTBOX_RETRY_DELAY * 2 ** (
+                    message.attempts - 1
+                )
+                message.next_attempt_at = now + timedelta(seconds=delay)
+    with transaction.atomic():
+        for message in messages:
+            message.save(update_fields=(
+                'attempts', 'status', 'sent_at', 'last_error',
+                'next_attempt_at',
+            ))
+
+
+def send_batch(size, workers):
+    """Отправляет одну пачку писем пулом из workers потоков.
+
+    Возвращает число отправленных писем и число ошибок. База
+    используется только из вызывающего потока.
+    """
+    messages = claim_batch(size)
+    if not messages:
+        return 0, 0
+    chunks = [messages[start::workers] for start in range(workers)]
+    chunks = [chunk for chunk in chunks if chunk]
+    with ThreadPoolExecutor(len(chunks)) as pool:
+        results = list(pool.map(send_chunk, chunks))
+    messages = [message for chunk in chunks for message in chunk]
+    errors = [error for chunk_errors in results for error in chunk_errors]
+    record_results(messages, errors)
+    failed = sum(error is not None for error in errors)
+    return len(errors) - failed, failed
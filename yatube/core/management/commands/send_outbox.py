@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.mail import send_batch
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди через OUTBOX_EMAIL_BACKEND'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE,
+        )
+        parser.add_argument(
+            '--workers', type=int, default=settings.OUTBOX_WORKERS,
+            help='Сколько потоков отправляют письма одновременно',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help='Пауза в секундах, когда очередь пуста',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Разобрать очередь и выйти',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError('Размер пачки и число потоков должны быть > 0')
+        while True:
+            sent, failed = send_batch(
+                options['batch_size'], options['workers']
+            )
+            if sent or failed:
+                self.stdout.write(f'Отправлено {sent}, ошибок {failed}')
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
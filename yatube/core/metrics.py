@@ -0,0 +1,200 @@
+# core/metrics.py
+import glob
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+# Границы корзин гистограмм: время ответа в секундах и размер в байтах
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+HISTOGRAMS = {
+    'yatube_request_duration_seconds': (
+        'Время ответа view', LATENCY_BUCKETS,
+    ),
+    'yatube_response_size_bytes': ('Размер ответа view', SIZE_BUCKETS),
+}
+COUNTERS = {
+    'yatube_sql_queries_total': 'Число SQL-запросов',
+    'yatube_sql_duration_seconds_total': 'Время SQL-запросов',
+    'yatube_template_render_seconds_total': 'Время отрисовки шаблонов',
+}
+KEY_SEPARATOR = '\t'
+FILE_PREFIX = 'metrics_'
+INITIAL_FILE_SIZE = 64 * 1024
+
+
+class MmapValues:
+    """Числа процесса в файле, отображённом в память.
+
+    Файл: 8 байт занятого размера, затем записи
+    [длина ключа: 4 байта][ключ, выровненный до 8 байт][double].
+    Каждый процесс пишет только в свой файл, поэтому блокировки между
+    процессами не нужны; читатель складывает файлы всех процессов.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a+b')
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.truncate(INITIAL_FILE_SIZE)
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), self._size)
+        self._positions = {}
+        self._used = struct.unpack_from('q', self._map, 0)[0] or 8
+        for key, _, position in read_entries(self._map, self._used):
+            self._positions[key] = position
+
+    def _add_key(self, key):
+        encoded = key.encode()
+        padded = len(encoded) + (-(len(encoded) + 4) % 8)
+        entry = struct.pack(f'i{padded}sd', len(encoded), encoded, 0.0)
+        while self._used + len(entry) > self._size:
+            self._size *= 2
+            self._map.close()
+            self._file.truncate(self._size)
+            self._map = mmap.mmap(self._file.fileno(), self._size)
+        self._map[self._used:self._used + len(entry)] = entry
+        self._positions[key] = self._used + len(entry) - 8
+        self._used += len(entry)
+        struct.pack_into('q', self._map, 0, self._used)
+
+    def inc(self, key, amount):
+        if key not in self._positions:
+            self._add_key(key)
+        position = self._positions[key]
+        value = struct.unpack_from('d', self._map, position)[0]
+        struct.pack_into('d', self._map, position, value + amount)
+
+
+def read_entries(data, used):
+    """(ключ, значение, смещение значения) из данных файла метрик."""
+    position = 8
+    while position < used:
+        length = struct.unpack_from('i', data, position)[0]
+        padded = length + (-(length + 4) % 8)
+        key = bytes(data[position + 4:position + 4 + length]).decode()
+        position += 4 + padded
+        yield key, struct.unpack_from('d', data, position)[0], position
+        position += 8
+
+
+def read_file(path):
+    with open(path, 'rb') as file:
+        data = file.read()
+    if len(data) < 8:
+        return []
+    used = struct.unpack_from('q', data, 0)[0]
+    return [(key, value) for key, value, _ in read_entries(data, used)]
+
+
+class MetricsStore:
+    """Накопленные метрики: в памяти процесса или в общем каталоге.
+
+    С settings.METRICS_DIR каждый процесс (воркер gunicorn и т. п.)
+    ведёт свой файл metrics_<pid>, а выгрузка складывает все файлы.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+        self._files = {}
+
+    def _mmap_values(self):
+        pid = os.getpid()
+        if pid not in self._files:
+            path = os.path.join(settings.METRICS_DIR, f'{FILE_PREFIX}{pid}')
+            self._files[pid] = MmapValues(path)
+        return self._files[pid]
+
+    def inc(self, key, amount=1.0):
+        with self._lock:
+            if settings.METRICS_DIR:
+                self._mmap_values().inc(key, amount)
+            else:
+                self._values[key] += amount
+
+    def totals(self):
+        if not settings.METRICS_DIR:
+            with self._lock:
+                return dict(self._values)
+        totals = defaultdict(float)
+        pattern = os.path.join(settings.METRICS_DIR, f'{FILE_PREFIX}*')
+        for path in glob.glob(pattern):
+            for key, value in read_file(path):
+                totals[key] += value
+        return totals
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+store = MetricsStore()
+
+
+def metric_key(name, view, bucket=''):
+    return KEY_SEPARATOR.join((name, view, str(bucket)))
+
+
+def observe(name, view, value):
+    """Добавляет значение в гистограмму name."""
+    _, buckets = HISTOGRAMS[name]
+    bucket = next((bound for bound in buckets if value <= bound), '+Inf')
+    store.inc(metric_key(name, view, bucket))
+    store.inc(metric_key(name + '_sum', view), value)
+
+
+def record_request(view, measurement, size):
+    """Учитывает затраты одного запроса к view."""
+    observe(
+        'yatube_request_duration_seconds', view, measurement.total_time
+    )
+    if size is not None:
+        observe('yatube_response_size_bytes', view, size)
+    store.inc(metric_key('yatube_sql_queries_total', view),
+              measurement.queries)
+    store.inc(metric_key('yatube_sql_duration_seconds_total', view),
+              measurement.sql_time)
+    store.inc(metric_key('yatube_template_render_seconds_total', view),
+              measurement.render_time)
+
+
+def format_labels(view, bucket=None):
+    view = view.replace('\\', '\\\\').replace('"', '\\"')
+    if bucket is None:
+        return f'{{view="{view}"}}'
+    return f'{{view="{view}",le="{bucket}"}}'
+
+
+def exposition():
+    """Метрики в текстовом формате Prometheus."""
+    by_metric = defaultdict(lambda: defaultdict(dict))
+    for key, value in store.totals().items():
+        name, view, bucket = key.split(KEY_SEPARATOR)
+        by_metric[name][view][bucket] = value
+    lines = []
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for view in sorted(by_metric[name]):
+            counts = by_metric[name][view]
+            total = 0.0
+            for bound in (*buckets, '+Inf'):
+                total += counts.get(str(bound), 0)
+                lines.append(
+                    f'{name}_bucket{format_labels(view, bound)} {total!r}'
+                )
+            value = by_metric[name + '_sum'][view].get('', 0.0)
+            lines.append(f'{name}_sum{format_labels(view)} {value!r}')
+            lines.append(f'{name}_count{format_labels(view)} {total!r}')
+    for name, help_text in COUNTERS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for view in sorted(by_metric[name]):
+            value = by_metric[name][view].get('', 0.0)
+            lines.append(f'{name}{format_labels(view)} {value!r}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,72 @@
+# core/middleware.py
+from django.conf import settings
+
+from .instrumentation import measure, set_current_view
+from .metrics import record_request
+from .profiler import profile_request, profile_requested
+from .replica import PIN_COOKIE, request_wrote, start_request
+
+
+class RequestMetricsMiddleware:
+    """Собирает время, SQL, отрисовку и размер ответа каждого view.
+
+    Стоит первым в MIDDLEWARE, чтобы учитывать и запросы сессий.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            with measure() as measurement:
+                response = self.get_response(request)
+        finally:
+            set_current_view(None)
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        size = None if response.streaming else len(response.content)
+        record_request(view, measurement, size)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Имя view нужно журналу медленных запросов во время его работы
+        set_current_view(request.resolver_match.view_name)
+
+
+class ProfilerMiddleware:
+    """Профилирует запрос сотрудника по ?_profile или заголовку X-Profile.
+
+    Стоит после AuthenticationMiddleware. Без параметра и заголовка
+    запрос проходит как обычно, не касаясь пользователя.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if profile_requested(request) and request.user.is_staff:
+            return profile_request(self.get_response, request)
+        return self.get_response(request)
+
+
+class ReplicaPinMiddleware:
+    """Закрепляет за пользователем основную базу после записи.
+
+    Реплика отстаёт от основной базы, поэтому после поста или правки
+    автор REPLICA_PIN_SECONDS секунд читает ленты из основной базы и
+    сразу видит свои изменения.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start_request()
+        response = self.get_response(request)
+        if request_wrote():
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+            )
+        return response
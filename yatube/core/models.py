@@ -0,0 +1,44 @@
+# core/models.py
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """Письмо, ожидающее отправки командой send_outbox."""
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Ожидает отправки'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    # Письмо целиком: адреса, заголовки, тело и альтернативы в JSON
+    payload = models.TextField('Письмо')
+    status = models.CharField(
+        'Статус', max_length=10, choices=STATUSES, default=PENDING
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    # Время следующей попытки; send_outbox сдвигает его и на время
+    # отправки, чтобы другой процесс не взял то же письмо
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='outbox_due_idx',
+            ),
+        )
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.pk}: {self.status}'
@@ -0,0 +1,112 @@
+# core/profiler.py
+import cProfile
+import io
+import pstats
+import threading
+import tracemalloc
+
+from django.http import HttpResponse
+
+from .instrumentation import explain, measure
+
+# Профиль включается параметром ?_profile или заголовком X-Profile
+PROFILE_PARAM = '_profile'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 20
+# tracemalloc общий на процесс: запрос, закончивший первым, остановил
+# бы трассировку посреди чужого профиля, поэтому профили идут по одному
+_profile_lock = threading.Lock()
+
+
+def profile_requested(request):
+    return PROFILE_PARAM in request.GET or PROFILE_HEADER in request.META
+
+
+def format_functions(profiler):
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+    return out.getvalue().strip().splitlines()
+
+
+def format_allocations(snapshot):
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+    ))
+    return [
+        f'{stat.size / 1024:9.1f} КиБ {stat.count:7} блоков  '
+        f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}'
+        for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]
+    ]
+
+
+def format_statements(statements):
+    lines = []
+    for number, statement in enumerate(statements, 1):
+        sql, params, many, elapsed, alias = statement
+        lines.append(f'{number}. {elapsed * 1000:.2f} мс, база {alias}')
+        lines.append(f'   {sql}')
+        if params and not many:
+            lines.append(f'   параметры: {params!r}')
+        lines.extend(
+            f'   план: {line}' for line in ([] if many else explain(
+                sql, params, alias
+            ))
+        )
+    return lines
+
+
+def format_templates(template_trace):
+    return [
+        f'{"  " * depth}{name} {elapsed * 1000:.2f} мс'
+        for name, depth, elapsed in template_trace
+    ]
+
+
+def profile_request(get_response, request):
+    """Выполняет запрос под cProfile и tracemalloc и возвращает отчёт.
+
+    Отчёт заменяет ответ view: в нём самые затратные функции, места
+    выделения памяти, все SQL-запросы с планами и время шаблонов.
+    """
+    with _profile_lock:
+        return profile_response(get_response, request)
+
+
+def profile_response(get_response, request):
+    profiler = cProfile.Profile()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        with measure(trace=True) as measurement:
+            profiler.enable()
+            try:
+                response = get_response(request)
+            finally:
+                profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    size = 'потоковый' if response.streaming else len(response.content)
+    sections = [
+        [
+            f'Профиль запроса {request.method} {request.get_full_path()}',
+            f'Ответ {response.status_code}, размер {size}, '
+            f'время {measurement.total_time * 1000:.2f} мс',
+            f'SQL: {measurement.queries} запросов, '
+            f'{measurement.sql_time * 1000:.2f} мс; '
+            f'шаблоны: {measurement.render_time * 1000:.2f} мс',
+        ],
+        ['== Функции ==', *format_functions(profiler)],
+        ['== Выделение памяти ==', *format_allocations(snapshot)],
+        ['== SQL-запросы ==', *format_statements(measurement.statements)],
+        ['== Шаблоны ==', *format_templates(measurement.template_trace)],
+    ]
+    report = '\n\n'.join('\n'.join(section) for section in sections)
+    return HttpResponse(
+        report + '\n', content_type='text/plain; charset=utf-8'
+    )
@@ -0,0 +1,101 @@
+# core/replica.py
+import os
+import threading
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+# Кука, по которой автор после записи читает ленты из основной базы
+PIN_COOKIE = 'pin_primary'
+
+_state = threading.local()
+
+
+def replica_ready():
+    """Есть ли отдельная реплика, из которой можно читать.
+
+    Реплики нет, пока refresh_replica не создал её файл. В тестах
+    реплика — зеркало основной базы с тем же именем, и чтение из неё
+    через другое соединение не увидело бы данных текущей транзакции.
+    """
+    alias = settings.REPLICA_DATABASE
+    if not alias or alias not in settings.DATABASES:
+        return False
+    name = connections[alias].settings_dict['NAME']
+    return (
+        name != connections['default'].settings_dict['NAME']
+        and os.path.exists(name)
+    )
+
+
+def used_databases():
+    """Базы, к которым обращаются запросы: основная и готовая реплика."""
+    if replica_ready():
+        return ['default', settings.REPLICA_DATABASE]
+    return ['default']
+
+
+def replica_reads(view):
+    """Направляет чтения моделей REPLICA_APPS во время view в реплику.
+
+    Чтения остаются в основной базе для небезопасных методов и для
+    пользователя, который недавно что-то записал (кука PIN_COOKIE).
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or PIN_COOKIE in request.COOKIES
+            or not replica_ready()
+        ):
+            return view(request, *args, **kwargs)
+        _state.replica = True
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _state.replica = False
+
+    return wrapper
+
+
+def start_request():
+    _state.wrote = False
+
+
+def request_wrote():
+    """Записывал ли текущий запрос что-нибудь в базу."""
+    return getattr(_state, 'wrote', False)
+
+
+class ReplicaRouter:
+    """Чтения из реплики внутри replica_reads, всё остальное — в основную.
+
+    Пользователи, сессии и прочие модели вне REPLICA_APPS всегда
+    читаются из основной базы: вход и выход должны быть видны сразу.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            getattr(_state, 'replica', False)
+            and model._meta.app_label in settings.REPLICA_APPS
+        ):
+            return settings.REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика — копия основной базы, связи между ними допустимы
+        databases = {'default', settings.REPLICA_DATABASE}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема попадает в реплику вместе с данными при копировании
+        if db == settings.REPLICA_DATABASE:
+            return False
+        return None
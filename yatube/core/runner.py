@@ -0,0 +1,15 @@
+# core/runner.py
+from django.test.runner import DiscoverRunner
+
+# Тесты с этими метками медленные и зависят от машины, поэтому
+# запускаются только явно: manage.py test --tag performance
+OPT_IN_TAGS = {'performance'}
+
+
+class TestRunner(DiscoverRunner):
+    """Обычный запуск тестов без тестов производительности."""
+
+    def __init__(self, tags=None, exclude_tags=None, **kwargs):
+        skipped = OPT_IN_TAGS - set(tags or ())
+        exclude_tags = set(exclude_tags or ()) | skipped
+        super().__init__(tags=tags, exclude_tags=exclude_tags, **kwargs)
@@ -0,0 +1,183 @@
+# core/slow_queries.py
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from time import perf_counter
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+from django.template.base import Node
+
+from .instrumentation import current_view, explain
+
+logger = logging.getLogger('core.slow_queries')
+_listener = None
+_listener_lock = threading.Lock()
+# Кадры самого журнала и инструментирования не интересны в месте вызова
+CORE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Одна запись журнала — одна строка JSON."""
+
+    def format(self, record):
+        return json.dumps(record.query, ensure_ascii=False, default=str)
+
+
+class ExplainingListener(QueueListener):
+    """QueueListener, дописывающий к записи план запроса.
+
+    EXPLAIN выполняется в потоке журнала через его собственное
+    соединение, а не в потоке запроса, который и так уже медленный.
+    """
+
+    def prepare(self, record):
+        query = record.query
+        try:
+            query['plan'] = (
+                [] if query['many']
+                else explain(query['sql'], query['params'],
+                             query['database'])
+            )
+        except DatabaseError:
+            # Например, запрос к временной таблице соединения запроса
+            query['plan'] = []
+        return record
+
+
+def call_site(frame):
+    """Кадры кода проекта, выполнившие запрос, и строка шаблона.
+
+    Кадры перечисляются от внешнего к внутреннему; строка шаблона
+    берётся у самого внутреннего узла, который отрисовывался.
+    """
+    stack = []
+    template = None
+    while frame is not None:
+        code = frame.f_code
+        node = frame.f_locals.get('self')
+        if (
+            template is None
+            and code.co_name == 'render_annotated'
+            and isinstance(node, Node)
+            and getattr(node, 'token', None) is not None
+        ):
+            template = f'{node.origin.template_name}:{node.token.lineno}'
+        elif (
+            code.co_filename.startswith(settings.BASE_DIR)
+            and not code.co_filename.startswith(CORE_DIR)
+        ):
+            path = os.path.relpath(code.co_filename, settings.BASE_DIR)
+            stack.append(f'{path}:{frame.f_lineno} {code.co_name}')
+        frame = frame.f_back
+    return stack[::-1], template
+
+
+def log_slow_query(execute, sql, params, many, context):
+    """execute_wrapper, записывающий запросы дольше порога."""
+    threshold = settings.SLOW_QUERY_THRESHOLD
+    if threshold is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    result = execute(sql, params, many, context)
+    elapsed = perf_counter() - started
+    if elapsed < threshold or not start_log():
+        return result
+    stack, template = call_site(sys._getframe(1))
+    # План добавляет ExplainingListener в потоке журнала
+    logger.warning('slow query', extra={'query': {
+        'time': datetime.now(timezone.utc).isoformat(),
+        'duration': round(elapsed, 6),
+        'database': context['connection'].alias,
+        'sql': sql,
+        'params': None if many else params,
+        'many': many,
+        'view': current_view(),
+        'stack': stack,
+        'template': template,
+    }})
+    return result
+
+
+def add_wrapper(connection):
+    # Обёртка ставится первой: execute_wrapper() снимает последнюю
+    # в списке, и соединение, открытое внутри measure, не должно её
+    # потерять
+    if log_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, log_slow_query)
+
+
+def connection_opened(sender, connection, **kwargs):
+    if connection.alias == settings.SLOW_QUERY_DATABASE:
+        add_wrapper(connection)
+
+
+def start_log():
+    """Запускает запись журнала в отдельном потоке, если он включён.
+
+    Вызывается на первом медленном запросе, так что команды без
+    медленных запросов не заводят ни поток, ни каталог журнала.
+    Запрос только кладёт запись в очередь; EXPLAIN, сериализацию и
+    запись в файл с ротацией выполняет ExplainingListener.
+    """
+    global _listener
+    if not settings.SLOW_QUERY_LOG:
+        return False
+    with _listener_lock:
+        if _listener is None:
+            _listener = open_log()
+    return True
+
+
+def open_log():
+    os.makedirs(os.path.dirname(settings.SLOW_QUERY_LOG), exist_ok=True)
+    handler = RotatingFileHandler(
+        settings.SLOW_QUERY_LOG,
+        maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+        backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+        encoding='utf-8',
+        delay=True,
+    )
+    handler.setFormatter(JsonLinesFormatter())
+    records = queue.Queue()
+    listener = ExplainingListener(records, handler)
+    listener.start()
+    logger.addHandler(QueueHandler(records))
+    logger.setLevel(logging.WARNING)
+    logger.propagate = False
+    return listener
+
+
+def stop_log():
+    """Дописывает записи из очереди и закрывает файл журнала."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+        _listener = None
+
+
+def install():
+    """Подключает журнал медленных запросов к соединению базы.
+
+    Без порога или файла журнала запросы не оборачиваются вовсе.
+    """
+    if settings.SLOW_QUERY_THRESHOLD is None or not settings.SLOW_QUERY_LOG:
+        return
+    connection_created.connect(connection_opened)
+    connection = connections[settings.SLOW_QUERY_DATABASE]
+    if connection.connection is not None:
+        add_wrapper(connection)
+    atexit.register(stop_log)
@@ -0,0 +1,55 @@
+# core/sqlite.py
+import time
+
+from django.conf import settings
+from django.db import OperationalError
+from django.db.backends.signals import connection_created
+
+# Пауза перед первым повтором запроса, удваивается с каждой попыткой
+RETRY_DELAY = 0.05
+
+
+def is_busy(error):
+    return 'database is locked' in str(error)
+
+
+def retry_on_busy(execute, sql, params, many, context):
+    """execute_wrapper, повторяющий запрос к занятой базе.
+
+    Повторять можно только то, что целиком откатывается при ошибке:
+    запрос вне транзакции и начало транзакции. Транзакции начинаются
+    с BEGIN IMMEDIATE — блокировка записи берётся сразу, и транзакция
+    не упирается в занятую базу посередине, когда повтор уже невозможен.
+    """
+    begin = sql == 'BEGIN'
+    if begin and settings.SQLITE_IMMEDIATE_TRANSACTIONS:
+        sql = 'BEGIN IMMEDIATE'
+    if not begin and context['connection'].in_atomic_block:
+        return execute(sql, params, many, context)
+    retries = settings.SQLITE_BUSY_RETRIES
+    for attempt in range(retries + 1):
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as error:
+            if attempt == retries or not is_busy(error):
+                raise
+            time.sleep(RETRY_DELAY * 2 ** attempt)
+
+
+def configure_connection(sender, connection, **kwargs):
+    """Настраивает каждое новое соединение с SQLite.
+
+    PRAGMA выполняются на соединении драйвера, минуя курсоры Django,
+    чтобы не попадать в connection.queries и лимиты запросов.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for pragma, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {pragma} = {value}')
+    # Обёртка ставится первой, как и в журнале медленных запросов
+    if retry_on_busy not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, retry_on_busy)
+
+
+def install():
+    connection_created.connect(configure_connection)
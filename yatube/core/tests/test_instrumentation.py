@@ -0,0 +1,29 @@
+# core/tests/test_instrumentation.py
+from django.contrib.auth import get_user_model
+from django.template.loader import render_to_string
+from django.test import TestCase
+
+from core.instrumentation import measure
+
+User = get_user_model()
+
+
+class MeasureTests(TestCase):
+    def test_counts_queries_and_templates(self):
+        """measure считает запросы и отрисовку шаблонов внутри блока"""
+        with measure() as measurement:
+            User.objects.count()
+            render_to_string('about/tech.html')
+        self.assertEqual(measurement.queries, 1)
+        self.assertEqual(
+            [name for name, _ in measurement.templates], ['about/tech.html']
+        )
+        self.assertGreater(measurement.render_time, 0)
+        self.assertGreaterEqual(
+            measurement.total_time,
+            measurement.render_time + measurement.sql_time,
+        )
+
+    def test_outside_measure_nothing_is_recorded(self):
+        """Вне блока measure шаблоны отрисовываются как обычно"""
+        self.assertIn('<', render_to_string('about/tech.html'))
@@ -0,0 +1,82 @@
+# core/tests/test_metrics.py
+import os
+import tempfile
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.metrics import FILE_PREFIX, MmapValues, exposition, metric_key, store
+
+User = get_user_model()
+METRICS_URL = '/metrics'
+
+
+class RequestMetricsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+
+    def setUp(self):
+        store.clear()
+        self.staff_client = Client()
+        self.staff_client.force_login(self.admin)
+
+    def test_metrics_require_staff(self):
+        """Метрики видны только сотрудникам"""
+        response = Client().get(METRICS_URL)
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        response = self.staff_client.get(METRICS_URL)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+    def test_views_are_recorded(self):
+        """Запросы к view попадают в гистограммы и счётчики"""
+        Client().get(reverse('posts:index'))
+        Client().get(reverse('posts:index'))
+        text = self.staff_client.get(METRICS_URL).content.decode()
+        self.assertIn(
+            'yatube_request_duration_seconds_count{view="posts:index"} 2.0',
+            text,
+        )
+        self.assertIn(
+            'yatube_request_duration_seconds_bucket'
+            '{view="posts:index",le="+Inf"} 2.0',
+            text,
+        )
+        self.assertIn('yatube_sql_queries_total{view="posts:index"}', text)
+        self.assertIn(
+            'yatube_template_render_seconds_total{view="posts:index"}', text
+        )
+        self.assertIn(
+            'yatube_response_size_bytes_sum{view="posts:index"}', text
+        )
+
+    def test_worker_files_are_summed(self):
+        """Метрики процессов из общего каталога складываются"""
+        with tempfile.TemporaryDirectory() as directory:
+            key = metric_key('yatube_sql_queries_total', 'posts:index')
+            for pid, amount in ((1, 2), (2, 3)):
+                values = MmapValues(
+                    os.path.join(directory, f'{FILE_PREFIX}{pid}')
+                )
+                values.inc(key, amount)
+                # Длинные ключи заставляют файл расти
+                for number in range(2000):
+                    values.inc(metric_key(
+                        'yatube_sql_queries_total', f'view:{number}'
+                    ), 1)
+            reopened = MmapValues(os.path.join(directory, f'{FILE_PREFIX}1'))
+            reopened.inc(key, 1)
+            with override_settings(METRICS_DIR=directory):
+                text = exposition()
+        self.assertIn(
+            'yatube_sql_queries_total{view="posts:index"} 6.0', text
+        )
+        self.assertIn(
+            'yatube_sql_queries_total{view="view:1999"} 2.0', text
+        )
@@ -0,0 +1,89 @@
+# core/tests/test_outbox.py
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPConnectError, SMTPException
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import OutboxMessage
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.OutboxBackend',
+    OUTBOX_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class OutboxTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        User.objects.create_user(
+            username='HasNoName', email='user@example.com',
+            password='password',
+        )
+
+    def reset_password(self):
+        self.client.post(
+            reverse('users:password_reset_form'),
+            {'email': 'user@example.com'},
+        )
+
+    def send_outbox(self):
+        call_command('send_outbox', '--once', stdout=StringIO())
+
+    def test_reset_is_queued(self):
+        """Сброс пароля ставит письмо в очередь, не отправляя его"""
+        self.reset_password()
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+        self.assertEqual(mail.outbox, [])
+
+    def test_send_outbox_delivers(self):
+        """send_outbox отправляет письма через настроенный бэкенд"""
+        self.reset_password()
+        self.send_outbox()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['user@example.com'])
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.status, OutboxMessage.SENT)
+        self.assertEqual(message.attempts, 1)
+
+    @mock.patch.object(
+        EmailBackend, 'send_messages', side_effect=SMTPException('down')
+    )
+    def test_failed_message_is_retried_later(self, send_messages):
+        """Неудачное письмо откладывается, а после лимита попыток — failed"""
+        self.reset_password()
+        self.send_outbox()
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.status, OutboxMessage.PENDING)
+        self.assertIn('down', message.last_error)
+        self.assertGreater(
+            message.next_attempt_at, timezone.now() + timedelta(seconds=30)
+        )
+        OutboxMessage.objects.update(next_attempt_at=timezone.now())
+        with override_settings(OUTBOX_MAX_ATTEMPTS=2):
+            self.send_outbox()
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxMessage.FAILED)
+        self.assertEqual(message.attempts, 2)
+
+    @mock.patch.object(
+        EmailBackend, 'open', side_effect=SMTPConnectError(421, 'down')
+    )
+    def test_unavailable_server_is_retried_later(self, open_connection):
+        """Недоступный сервер откладывает письма, а не роняет команду"""
+        self.reset_password()
+        self.send_outbox()
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.status, OutboxMessage.PENDING)
+        self.assertEqual(message.attempts, 1)
+        self.assertIn('SMTPConnectError', message.last_error)
+        self.assertGreater(message.next_attempt_at, timezone.now())
@@ -0,0 +1,160 @@
+# core/tests/test_performance.py
+import json
+import os
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client, TestCase, tag
+from django.urls import URLPattern, reverse
+
+from about import urls as about_urls
+from core.instrumentation import measure
+from posts import urls as posts_urls
+from posts.models import Group, Post, User
+from users import urls as users_urls
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+# PERF_UPDATE_BASELINE=1 записывает замеры в baseline.json вместо проверки
+UPDATE_BASELINE = os.getenv('PERF_UPDATE_BASELINE') == '1'
+PERF_POSTS = int(os.getenv('PERF_POSTS', 20000))
+# Сколько раз повторять запрос; берётся лучший замер
+RUNS = 3
+# Запас на шум к каждому бюджету времени: замеры в единицы
+# миллисекунд колеблются сильнее, чем позволил бы PERF_BUDGET_MARGIN
+TIME_NOISE_MS = 10
+# Маршрут без работы с данными, по которому время сравнивается с
+# машиной базовых замеров; он быстрый, поэтому замеряется чаще
+CALIBRATION_ROUTE = 'about:tech'
+CALIBRATION_RUNS = 20
+# Параметры GET для маршрутов, которым без них нечего показать
+ROUTE_QUERIES = {
+    'posts:search': {'q': 'кошка'},
+}
+METRICS = ('queries', 'sql_ms', 'render_ms', 'total_ms')
+ADMIN_CHANGELIST = 'admin:posts_post_changelist'
+
+
+def routes():
+    """Имена и шаблоны всех маршрутов posts, users и about."""
+    for module in (posts_urls, users_urls, about_urls):
+        for pattern in module.urlpatterns:
+            if isinstance(pattern, URLPattern):
+                yield f'{module.app_name}:{pattern.name}', pattern
+
+
+@tag('performance')
+class ViewPerformanceTests(TestCase):
+    """Замеры каждого маршрута на большом наборе данных.
+
+    Число запросов не должно расти — это жёсткий предел. Время SQL,
+    отрисовки и ответа не должно превышать базовое больше чем на
+    settings.PERF_BUDGET_MARGIN и TIME_NOISE_MS; на машине медленнее
+    той, где сняты базовые замеры, бюджеты растут во столько раз, во
+    сколько медленнее маршрут CALIBRATION_ROUTE.
+    Запускаются только явно: manage.py test --tag performance.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        call_command(
+            'seed', users=500, groups=50, posts=PERF_POSTS, seed=0,
+            stdout=StringIO(),
+        )
+        cls.group = Group.objects.order_by('pk').first()
+        cls.post = Post.objects.order_by('pk').first()
+        cls.user = User.objects.get(pk=cls.post.author_id)
+        cls.route_kwargs = {
+            'slug': cls.group.slug,
+            'username': cls.user.username,
+            'post_id': cls.post.pk,
+        }
+        cls.admin = User.objects.create_superuser(
+            'perf_admin', 'admin@example.com', 'password'
+        )
+        # Список постов в админке: весь, за год и с поиском
+        cls.admin_routes = {
+            ADMIN_CHANGELIST: {},
+            f'{ADMIN_CHANGELIST}[year]': {
+                'pub_date__year': cls.post.pub_date.year,
+            },
+            f'{ADMIN_CHANGELIST}[q]': {'q': 'кошка'},
+        }
+
+    def measure_url(self, url, data=None, user=None, runs=RUNS):
+        results = []
+        # Первый запрос прогревает кэши карточек и шаблонов
+        for _ in range(runs + 1):
+            client = Client()
+            client.force_login(user or self.user)
+            with measure() as measurement:
+                client.get(url, data)
+            results.append({
+                'queries': measurement.queries,
+                'sql_ms': measurement.sql_time * 1000,
+                'render_ms': measurement.render_time * 1000,
+                'total_ms': measurement.total_time * 1000,
+            })
+        return {
+            metric: round(min(result[metric] for result in results[1:]), 2)
+            for metric in METRICS
+        }
+
+    def measure_route(self, name, pattern):
+        url = reverse(name, kwargs={
+            key: self.route_kwargs[key] for key in pattern.pattern.converters
+        })
+        return self.measure_url(url, ROUTE_QUERIES.get(name))
+
+    def calibrate(self):
+        """Лучшее время ответа CALIBRATION_ROUTE на этой машине, мс."""
+        return self.measure_url(
+            reverse(CALIBRATION_ROUTE), runs=CALIBRATION_RUNS
+        )['total_ms']
+
+    def test_views_within_baseline(self):
+        """Каждый маршрут укладывается в базовые замеры"""
+        calibration = self.calibrate()
+        measured = {
+            name: self.measure_route(name, pattern)
+            for name, pattern in routes()
+        }
+        for name, data in self.admin_routes.items():
+            url = reverse(name.split('[')[0])
+            measured[name] = self.measure_url(url, data, self.admin)
+        if UPDATE_BASELINE:
+            with open(BASELINE_PATH, 'w', encoding='utf-8') as file:
+                json.dump(
+                    {
+                        'posts': PERF_POSTS,
+                        'calibration_ms': calibration,
+                        'routes': measured,
+                    },
+                    file, ensure_ascii=False, indent=2, sort_keys=True,
+                )
+                file.write('\n')
+            self.skipTest('Базовые замеры обновлены')
+        with open(BASELINE_PATH, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline['posts'] != PERF_POSTS:
+            self.skipTest(
+                f'Базовые замеры сняты на {baseline["posts"]} постах'
+            )
+        # Более быстрая машина бюджеты не ужесточает: её замеры и так
+        # в них укладываются
+        scale = max(calibration / baseline['calibration_ms'], 1)
+        margin = (1 + settings.PERF_BUDGET_MARGIN) * scale
+        for name, result in measured.items():
+            with self.subTest(route=name):
+                self.assertIn(
+                    name, baseline['routes'],
+                    'Нет базовых замеров: запустите с PERF_UPDATE_BASELINE=1',
+                )
+                expected = baseline['routes'][name]
+                self.assertLessEqual(
+                    result['queries'], expected['queries'], result
+                )
+                for metric in METRICS[1:]:
+                    budget = expected[metric] * margin + TIME_NOISE_MS
+                    self.assertLessEqual(result[metric], budget, result)
@@ -0,0 +1,101 @@
+# core/tests/test_profiler.py
+import threading
+import tracemalloc
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from core import profiler
+from core.instrumentation import explain
+from posts.models import Post
+
+User = get_user_model()
+INDEX_URL = 'posts:index'
+
+
+class ProfilerTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        Post.objects.create(text='Тестовый текст', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.staff_client = Client()
+        self.staff_client.force_login(self.admin)
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_staff_gets_report(self):
+        """Сотрудник по ?_profile получает отчёт вместо страницы"""
+        response = self.staff_client.get(reverse(INDEX_URL), {'_profile': 1})
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        report = response.content.decode()
+        for section in (
+            '== Функции ==', '== Выделение памяти ==',
+            '== SQL-запросы ==', '== Шаблоны ==',
+        ):
+            with self.subTest(section=section):
+                self.assertIn(section, report)
+        self.assertIn('FROM "posts_post"', report)
+        self.assertIn('план: ', report)
+        self.assertIn('posts/index.html', report)
+        self.assertIn('  includes/header.html', report)
+
+    def test_plans_use_statement_database(self):
+        """План запроса строится в той базе, где запрос выполнялся"""
+        with mock.patch.object(
+            profiler, 'explain', side_effect=explain
+        ) as explained:
+            self.staff_client.get(reverse(INDEX_URL), {'_profile': 1})
+        self.assertTrue(explained.call_args_list)
+        for call in explained.call_args_list:
+            self.assertIn(call.args[2], ('default', 'replica'))
+
+    def test_profiles_do_not_overlap(self):
+        """Профиль ждёт, пока закончится профиль другого запроса"""
+        responses = []
+
+        def profile():
+            responses.append(profiler.profile_request(
+                lambda request: HttpResponse('ok'),
+                RequestFactory().get('/', {'_profile': 1}),
+            ))
+
+        thread = threading.Thread(target=profile)
+        with profiler._profile_lock:
+            thread.start()
+            thread.join(0.2)
+            self.assertTrue(thread.is_alive())
+        thread.join()
+        self.assertEqual(responses[0].status_code, 200)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_header_enables_profile(self):
+        """Заголовок X-Profile включает профиль так же, как параметр"""
+        response = self.staff_client.get(
+            reverse(INDEX_URL), HTTP_X_PROFILE='1'
+        )
+        self.assertIn('Профиль запроса', response.content.decode())
+
+    def test_others_get_page(self):
+        """Прочим пользователям и обычным запросам отдаётся страница"""
+        for client, data in (
+            (Client(), {'_profile': 1}),
+            (self.authorized_client, {'_profile': 1}),
+            (self.staff_client, {}),
+        ):
+            with self.subTest(data=data):
+                response = client.get(reverse(INDEX_URL), data)
+                self.assertTrue(
+                    response['Content-Type'].startswith('text/html')
+                )
+                self.assertIn('Тестовый текст', response.content.decode())
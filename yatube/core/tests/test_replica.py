@@ -0,0 +1,80 @@
+# core/tests/test_replica.py
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from core.replica import PIN_COOKIE, replica_reads, replica_ready
+from posts.management.commands.refresh_replica import copy_to_replica
+from posts.models import Post
+
+User = get_user_model()
+
+
+@replica_reads
+def read_databases(request):
+    return router.db_for_read(Post), router.db_for_read(User)
+
+
+class ReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_mirror_is_not_used(self):
+        """В тестах реплика — зеркало основной базы и не используется"""
+        self.assertFalse(replica_ready())
+        request = self.factory.get('/')
+        self.assertEqual(read_databases(request), ('default', 'default'))
+
+    @mock.patch('core.replica.replica_ready', return_value=True)
+    def test_feed_reads_go_to_replica(self, ready):
+        """Посты читаются из реплики, пользователи — из основной базы"""
+        request = self.factory.get('/')
+        self.assertEqual(read_databases(request), ('replica', 'default'))
+        self.assertEqual(router.db_for_read(Post), 'default')
+
+    @mock.patch('core.replica.replica_ready', return_value=True)
+    def test_writes_and_pinned_users_use_primary(self, ready):
+        """POST и недавно писавший пользователь читают основную базу"""
+        pinned = self.factory.get('/')
+        pinned.COOKIES[PIN_COOKIE] = '1'
+        for request in (self.factory.post('/'), pinned):
+            with self.subTest(method=request.method):
+                self.assertEqual(
+                    read_databases(request), ('default', 'default')
+                )
+        self.assertEqual(router.db_for_write(Post), 'default')
+
+    def test_author_is_pinned_after_post(self):
+        """После публикации поста автор получает куку закрепления"""
+        client = Client()
+        client.force_login(User.objects.create_user(username='HasNoName'))
+        response = client.get(reverse('posts:index'))
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+        response = client.post(
+            reverse('posts:post_create'), {'text': 'Новый пост'}
+        )
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+
+class RefreshReplicaTests(TestCase):
+    def test_copy_to_replica(self):
+        """Копия через backup API содержит данные основной базы"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'replica.sqlite3')
+        with closing(sqlite3.connect(':memory:')) as source:
+            source.execute('CREATE TABLE t (x)')
+            source.execute('INSERT INTO t VALUES (1)')
+            source.commit()
+            copy_to_replica(source, path)
+        with closing(sqlite3.connect(path)) as replica:
+            self.assertEqual(
+                replica.execute('SELECT x FROM t').fetchall(), [(1,)]
+            )
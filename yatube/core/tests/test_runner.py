@@ -0,0 +1,14 @@
+# core/tests/test_runner.py
+from django.test import SimpleTestCase
+
+from core.runner import TestRunner
+
+
+class TestRunnerTests(SimpleTestCase):
+    def test_performance_is_opt_in(self):
+        """Тесты производительности идут только по --tag performance"""
+        runner = TestRunner(exclude_tags=['slow'])
+        self.assertEqual(runner.exclude_tags, {'slow', 'performance'})
+        runner = TestRunner(tags=['performance'])
+        self.assertEqual(runner.tags, {'performance'})
+        self.assertEqual(runner.exclude_tags, set())
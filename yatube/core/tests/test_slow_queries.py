@@ -0,0 +1,83 @@
+# core/tests/test_slow_queries.py
+import json
+import os
+import tempfile
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core import slow_queries
+from core.instrumentation import explain
+from posts.models import Post, User
+
+
+class SlowQueryLogTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        Post.objects.create(text='Тестовый текст', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'slow.jsonl')
+        settings = override_settings(SLOW_QUERY_LOG=self.path)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        slow_queries.stop_log()
+        self.addCleanup(slow_queries.stop_log)
+
+    def entries(self):
+        slow_queries.stop_log()
+        with open(self.path, encoding='utf-8') as log:
+            return [json.loads(line) for line in log]
+
+    @override_settings(SLOW_QUERY_THRESHOLD=0)
+    def test_slow_queries_are_logged(self):
+        """Запрос дольше порога пишется в журнал с планом и местом вызова"""
+        threads = set()
+
+        def explain_in_thread(*args):
+            threads.add(threading.current_thread())
+            return explain(*args)
+
+        with mock.patch.object(slow_queries, 'explain', explain_in_thread):
+            Client().get(reverse('posts:index'))
+            entries = self.entries()
+        self.assertTrue(threads)
+        self.assertNotIn(threading.current_thread(), threads)
+        self.assertTrue(entries)
+        entry = next(
+            entry for entry in entries
+            if entry['template'] and 'posts_post' in entry['sql']
+        )
+        self.assertEqual(entry['view'], 'posts:index')
+        self.assertTrue(entry['plan'])
+        self.assertGreaterEqual(entry['duration'], 0)
+        self.assertTrue(
+            any(frame.startswith('posts/') for frame in entry['stack'])
+        )
+        self.assertFalse(
+            any('EXPLAIN' in entry['sql'] for entry in entries)
+        )
+
+    @override_settings(SLOW_QUERY_THRESHOLD=60)
+    def test_fast_queries_are_skipped(self):
+        """Запросы быстрее порога в журнал не попадают"""
+        Client().get(reverse('posts:index'))
+        self.assertIsNone(slow_queries._listener)
+        self.assertFalse(os.path.exists(self.path))
+
+    @override_settings(SLOW_QUERY_THRESHOLD=None)
+    def test_disabled_log_is_not_installed(self):
+        """Выключенный журнал не подключается к соединениям"""
+        with mock.patch.object(
+            slow_queries.connection_created, 'connect'
+        ) as connect:
+            slow_queries.install()
+        connect.assert_not_called()
@@ -0,0 +1,66 @@
+# core/tests/test_sqlite.py
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, override_settings
+
+from core.sqlite import retry_on_busy
+
+
+class SQLiteTuningTests(SimpleTestCase):
+    databases = {'default'}
+
+    def pragma(self, name):
+        return connection.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+    def test_pragmas_are_applied(self):
+        """Новое соединение получает PRAGMA из настроек"""
+        connection.ensure_connection()
+        self.assertEqual(self.pragma('synchronous'), 1)
+        self.assertEqual(self.pragma('busy_timeout'), 5000)
+        self.assertEqual(self.pragma('cache_size'), -64 * 1024)
+
+    def context(self, in_atomic_block=False):
+        return {'connection': SimpleNamespace(
+            in_atomic_block=in_atomic_block
+        )}
+
+    @mock.patch('core.sqlite.time.sleep')
+    def test_busy_write_is_retried(self, sleep):
+        """Запрос вне транзакции повторяется, пока база занята"""
+        execute = mock.Mock(side_effect=[
+            OperationalError('database is locked'),
+            OperationalError('database is locked'),
+            'ok',
+        ])
+        result = retry_on_busy(execute, 'UPDATE t', (), False, self.context())
+        self.assertEqual(result, 'ok')
+        self.assertEqual(execute.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    @override_settings(SQLITE_BUSY_RETRIES=1)
+    @mock.patch('core.sqlite.time.sleep')
+    def test_retries_are_limited(self, sleep):
+        """После исчерпания повторов ошибка пробрасывается"""
+        execute = mock.Mock(
+            side_effect=OperationalError('database is locked')
+        )
+        with self.assertRaises(OperationalError):
+            retry_on_busy(execute, 'UPDATE t', (), False, self.context())
+        self.assertEqual(execute.call_count, 2)
+
+    def test_statement_in_transaction_is_not_retried(self):
+        """Внутри транзакции запрос не повторяется"""
+        execute = mock.Mock(
+            side_effect=OperationalError('database is locked')
+        )
+        with self.assertRaises(OperationalError):
+            retry_on_busy(execute, 'UPDATE t', (), False, self.context(True))
+        self.assertEqual(execute.call_count, 1)
+
+    def test_transactions_begin_immediate(self):
+        """Транзакции сразу берут блокировку записи"""
+        execute = mock.Mock()
+        retry_on_busy(execute, 'BEGIN', None, False, self.context(True))
+        self.assertEqual(execute.call_args[0][0], 'BEGIN IMMEDIATE')
@@ -0,0 +1,12 @@
+# core/views.py
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
+
+from .metrics import exposition
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@staff_member_required
+def metrics(request):
+    return HttpResponse(exposition(), content_type=PROMETHEUS_CONTENT_TYPE)
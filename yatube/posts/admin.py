@@ -1,19 +1,154 @@
 # posts/admin.py
+from django import forms
 from django.conf import settings
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import ValidationError
 
+from .bulk import move_posts
 from .models import Group, Post
+from .paginators import EstimatedCountPaginator
+from .search import search_posts
+
+
+class LoadedAutocompleteSelect(AutocompleteSelect):
+    """Автодополнение, которое не запрашивает выбранный объект заново.
+
+    AutocompleteSelect ищет подпись выбранного значения отдельным
+    запросом для каждого виджета — на странице списка это запрос на
+    строку. Если объект уже загружен через select_related, форма
+    передаёт его в loaded, и подпись берётся из него.
+    """
+    loaded = None
+
+    def optgroups(self, name, value, attr=None):
+        selected = [str(item) for item in value if item not in ('', None)]
+        if self.loaded is None or selected != [str(self.loaded.pk)]:
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        options.append(self.create_option(
+            name, self.loaded.pk,
+            self.choices.field.label_from_instance(self.loaded),
+            True, len(options),
+        ))
+        return [(None, options, 0)]
+
+
+class PostChangeListForm(forms.ModelForm):
+    """Форма строки списка постов с группой из самой строки."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        field = self.fields.get('group')
+        if field is None or self.instance.group_id is None:
+            return
+        # Поле обёрнуто в RelatedFieldWidgetWrapper
+        widget = getattr(field.widget, 'widget', field.widget)
+        if isinstance(widget, LoadedAutocompleteSelect):
+            widget.loaded = self.instance.group
+
+
+class PostActionForm(ActionForm):
+    """Панель действий списка постов с выбором группы для переноса."""
+    group = forms.ModelChoiceField(
+        Group.objects.all(),
+        required=False,
+        label='Группа',
+        widget=AutocompleteSelect(
+            Post._meta.get_field('group').remote_field, admin.site
+        ),
+    )
+
+
+class PostChangeList(ChangeList):
+    def get_results(self, request):
+        super().get_results(request)
+        # Число постов оценочное и может оказаться меньше настоящего;
+        # список без разбивки на страницы всё равно не длиннее
+        # list_max_show_all
+        if self.show_all or not self.multi_page:
+            self.result_list = self.result_list[:self.list_max_show_all]
 
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
     list_display = ('pk', 'text', 'pub_date', 'author', 'group',)
     list_editable = ('group',)
+    # Вместо <select> со всеми группами в каждой строке — поиск по
+    # страницам через autocomplete GroupAdmin и UserAdmin
+    autocomplete_fields = ('author', 'group')
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
+    # Фильтр и переходы по датам сводятся к диапазонам pub_date по
+    # индексу (templates/admin/posts/post/change_list.html)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    # Без второго COUNT(*) по всей таблице рядом с результатами поиска
+    show_full_result_count = False
     empty_value_display = settings.EMPTY_VALUE
+    # Переносят выбранные или все найденные посты пачками UPDATE
+    # (posts/bulk.py), а не сохранением каждого поста
+    actions = ('move_to_group', 'clear_group')
+    action_form = PostActionForm
+
+    def get_changelist(self, request, **kwargs):
+        return PostChangeList
+
+    def get_changelist_form(self, request, **kwargs):
+        kwargs.setdefault('form', PostChangeListForm)
+        return super().get_changelist_form(request, **kwargs)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in self.get_autocomplete_fields(request):
+            kwargs['widget'] = LoadedAutocompleteSelect(
+                db_field.remote_field, self.admin_site,
+                using=kwargs.get('using'),
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def update_group(self, request, queryset, group):
+        moved = move_posts(queryset, group)
+        self.message_user(
+            request, f'Перенесено постов: {moved}', messages.SUCCESS
+        )
+
+    def move_to_group(self, request, queryset):
+        field = self.action_form.base_fields['group']
+        try:
+            group = field.clean(request.POST.get('group'))
+        except ValidationError as error:
+            self.message_user(request, error.messages[0], messages.ERROR)
+            return
+        if group is None:
+            self.message_user(
+                request, 'Выберите группу для переноса', messages.ERROR
+            )
+            return
+        self.update_group(request, queryset, group)
+
+    move_to_group.short_description = 'Перенести в группу'
+    move_to_group.allowed_permissions = ('change',)
+
+    def clear_group(self, request, queryset):
+        self.update_group(request, queryset, None)
+
+    clear_group.short_description = 'Убрать из группы'
+    clear_group.allowed_permissions = ('change',)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск идёт по индексу FTS5, а не через LIKE по всей таблице
+        if not search_term.strip():
+            return queryset, False
+        return search_posts(queryset, search_term), False
 
 
 @admin.register(Group)
 class GroupAdmin(admin.ModelAdmin):
-    pass
+    # Нужны для autocomplete_fields в PostAdmin
+    search_fields = ('title', 'slug')
+    ordering = ('title',)
@@ -0,0 +1,103 @@
+# posts/api.py
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+
+from core.decorators import query_budget
+from core.replica import replica_reads
+
+from .conditional import (author_state, conditional_page, group_state,
+                          index_state)
+from .group_cache import get_group_or_404
+from .models import Post
+from .paginators import CursorPaginator
+
+User = get_user_model()
+
+# Поля ответа API и колонки, из которых они выбираются
+API_FIELDS = {
+    'id': 'pk',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'updated_at': 'updated_at',
+    'author': 'author__username',
+    'author_first_name': 'author__first_name',
+    'author_last_name': 'author__last_name',
+    'group': 'group__slug',
+    'group_title': 'group__title',
+}
+DEFAULT_FIELDS = ('id', 'text', 'pub_date', 'author', 'group')
+# Колонки ключа курсора выбираются всегда
+CURSOR_COLUMNS = ('pub_date', 'pk')
+JSON_PARAMS = {'ensure_ascii': False, 'separators': (',', ':')}
+
+
+class FieldsError(ValueError):
+    pass
+
+
+def requested_fields(request):
+    """Поля из параметра fields=id,text,... или поля по умолчанию."""
+    fields = [
+        name for name in request.GET.get('fields', '').split(',') if name
+    ]
+    unknown = [name for name in fields if name not in API_FIELDS]
+    if unknown:
+        raise FieldsError(f'Неизвестные поля: {", ".join(unknown)}')
+    return fields or list(DEFAULT_FIELDS)
+
+
+def feed_response(request, post_list):
+    """Страница ленты в JSON с курсорной пагинацией.
+
+    Из базы выбираются только колонки запрошенных полей, без моделей.
+    """
+    try:
+        fields = requested_fields(request)
+    except FieldsError as error:
+        return JsonResponse(
+            {'error': str(error)}, status=400, json_dumps_params=JSON_PARAMS
+        )
+    columns = {API_FIELDS[name] for name in fields} | set(CURSOR_COLUMNS)
+    paginator = CursorPaginator(
+        post_list.values(*columns), settings.PAGINATOR_VALUE
+    )
+    page_obj = paginator.get_cursor_page(
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+    results = [
+        {name: row[API_FIELDS[name]] for name in fields}
+        for row in page_obj
+    ]
+    return JsonResponse({
+        'results': results,
+        'next': page_obj.next_cursor if page_obj.has_next() else None,
+        'previous': (
+            page_obj.previous_cursor if page_obj.has_previous() else None
+        ),
+    }, json_dumps_params=JSON_PARAMS)
+
+
+@query_budget(5)
+@replica_reads
+@conditional_page(index_state)
+def index(request):
+    return feed_response(request, Post.objects.for_feed())
+
+
+@query_budget(6)
+@replica_reads
+@conditional_page(group_state)
+def group_posts(request, slug):
+    group = get_group_or_404(slug)
+    return feed_response(request, group.group.for_feed())
+
+
+@query_budget(6)
+@replica_reads
+@conditional_page(author_state)
+def profile(request, username):
+    author = get_object_or_404(User, username=username)
+    return feed_response(request, author.posts.for_feed())
@@ -0,0 +1,82 @@
+# posts/bulk.py
+import logging
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .counters import change_count
+from .models import GroupStats, Post
+from .page_cache import GLOBAL_SCOPE, bump_on_commit
+
+logger = logging.getLogger('posts.bulk')
+
+
+def chunked_pks(queryset, size):
+    """Ключи постов выборки пачками по size в порядке возрастания.
+
+    Следующая пачка берётся условием pk > последнего ключа, а не
+    OFFSET, поэтому каждая выборка идёт по первичному ключу и не
+    зависит от того, что предыдущие пачки уже изменены.
+    """
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        rest = pks if last is None else pks.filter(pk__gt=last)
+        chunk = list(rest[:size])
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1]
+
+
+@transaction.atomic
+def move_chunk(pks, group):
+    """Переносит пачку постов в group одним UPDATE.
+
+    Сигналы при этом не срабатывают, поэтому счётчики групп, версии
+    постов (ключи кэша карточек) и поколения лент сдвигаются здесь, в
+    той же транзакции. Возвращает число перенесённых постов.
+    """
+    posts = Post.objects.filter(pk__in=pks).exclude(group=group)
+    moved = dict(
+        posts.order_by().values_list('group').annotate(count=Count('pk'))
+    )
+    total = sum(moved.values())
+    if not total:
+        return 0
+    posts.update(
+        group=group,
+        version=F('version') + 1,
+        updated_at=timezone.now(),
+    )
+    for group_id, count in moved.items():
+        change_count(GroupStats, group_id, -count)
+    change_count(GroupStats, group and group.pk, total)
+    # Слаги групп в карточках меняются во всех лентах авторов
+    bump_on_commit(GLOBAL_SCOPE)
+    return total
+
+
+def move_posts(queryset, group, chunk_size=None):
+    """Переносит посты выборки в group; group=None убирает группу.
+
+    Каждая пачка из chunk_size постов — отдельная транзакция, так что
+    большой перенос не держит блокировку записи долго, а прерванный
+    оставляет счётчики верными. Ход переноса пишется в лог после
+    каждой пачки. Возвращает число перенесённых постов.
+    """
+    size = chunk_size or settings.BULK_UPDATE_CHUNK_SIZE
+    target = group.slug if group else 'без группы'
+    started = time.monotonic()
+    checked = moved = 0
+    for pks in chunked_pks(queryset, size):
+        moved += move_chunk(pks, group)
+        checked += len(pks)
+        logger.info(
+            'Перенос постов (%s): проверено %d, перенесено %d за %.1f с',
+            target, checked, moved, time.monotonic() - started,
+        )
+    return moved
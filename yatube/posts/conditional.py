@@ -0,0 +1,103 @@
+# posts/conditional.py
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.db.models import Max, Sum
+from django.views.decorators.http import condition
+
+from .counters import stored_count
+from .group_cache import get_group_or_404
+from .models import AuthorStats, Post
+from .page_cache import GLOBAL_SCOPE, get_generations
+
+
+def scope_state(posts, stats):
+    """Время последнего изменения и число постов ленты.
+
+    MAX(updated_at) берётся по индексу, число постов — из счётчиков,
+    поэтому оба запроса не читают ленту целиком. Число постов нужно,
+    чтобы удаление поста тоже меняло валидатор.
+    """
+    last = posts.aggregate(last=Max('updated_at'))['last']
+    count = stats.aggregate(count=Sum('posts_count'))['count']
+    return last, (count,)
+
+
+def index_state(request):
+    # Сумма счётчиков всех авторов дорожала бы с их числом; удаление
+    # поста главная лента замечает по своему поколению, которое
+    # сдвигают сигналы постов, импорт и seed. Поколение в кэше процесса
+    # другие воркеры не видят, поэтому без общего кэша остаётся сумма
+    if not settings.SHARED_CACHE:
+        return scope_state(Post.objects.all(), AuthorStats.objects.all())
+    last = Post.objects.aggregate(last=Max('updated_at'))['last']
+    return last, tuple(get_generations(('index',)))
+
+
+def group_state(request, slug):
+    # Группа и число её постов берутся из кэша групп, поэтому
+    # неизвестный слаг отвечает 404 без запросов, а для известного
+    # остаётся один MAX(updated_at) по индексу группы
+    group = get_group_or_404(slug)
+    last = Post.objects.filter(group_id=group.pk).aggregate(
+        last=Max('updated_at')
+    )['last']
+    return last, (stored_count(group),)
+
+
+def author_state(request, username):
+    return scope_state(
+        Post.objects.filter(author__username=username),
+        AuthorStats.objects.filter(author__username=username),
+    )
+
+
+def post_state(request, post_id):
+    # Страница записи выводит имя автора, группу и число постов автора
+    row = Post.objects.filter(pk=post_id).values_list(
+        'updated_at',
+        'author__post_stats__posts_count',
+        'author__username',
+        'author__first_name',
+        'author__last_name',
+        'group__title',
+        'group__slug',
+    ).first()
+    if row is None:
+        return None, ()
+    return row[0], row[1:]
+
+
+def conditional_page(state_func):
+    """Отвечает 304 Not Modified, если страница не менялась.
+
+    state_func(request, **kwargs) возвращает время последнего изменения
+    и прочие данные страницы. ETag учитывает также пользователя (шапка
+    страниц зависит от него) и общее поколение лент, которое сдвигается
+    при переименовании групп и авторов.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            last_modified, state = state_func(request, *args, **kwargs)
+            etag = None
+            if last_modified is not None:
+                parts = (
+                    request.user.pk,
+                    last_modified.isoformat(),
+                    state,
+                    get_generations((GLOBAL_SCOPE,)),
+                )
+                etag = hashlib.md5(repr(parts).encode()).hexdigest()
+            conditional_view = condition(
+                etag_func=lambda *args, **kwargs: etag,
+                last_modified_func=lambda *args, **kwargs: last_modified,
+            )(view)
+            return conditional_view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,105 @@
+# posts/counters.py
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from .models import AuthorStats, GroupStats, Post
+from .page_cache import get_generations
+
+# Модель счётчика и поле поста, по которому считаются посты
+COUNTERS = (
+    (AuthorStats, 'author'),
+    (GroupStats, 'group'),
+)
+
+
+def change_count(stats_model, key, delta):
+    """Сдвигает счётчик постов автора или группы на delta."""
+    if key is None:
+        return
+    field = stats_model._meta.pk.attname
+    updated = stats_model.objects.filter(pk=key).update(
+        posts_count=F('posts_count') + delta
+    )
+    if not updated and delta > 0:
+        stats_model.objects.create(**{field: key, 'posts_count': delta})
+
+
+def stored_count(owner):
+    """Число постов автора или группы из счётчика.
+
+    Счётчик стоит загрузить через select_related('post_stats'), тогда
+    запроса не будет. Владелец без строки счётчика ещё не писал постов.
+    """
+    try:
+        return owner.post_stats.posts_count
+    except ObjectDoesNotExist:
+        return 0
+
+
+def summed_count():
+    return AuthorStats.objects.aggregate(
+        total=Sum('posts_count')
+    )['total'] or 0
+
+
+def total_count():
+    """Число всех постов: сумма счётчиков авторов, закэшированная.
+
+    Ключ включает поколение главной ленты, поэтому сумма считается
+    заново после первого же изменения постов. Поколение в кэше процесса
+    другие воркеры не видят, поэтому без общего кэша сумма читается
+    из базы каждый раз.
+    """
+    if not settings.SHARED_CACHE:
+        return summed_count()
+    generation, = get_generations(('index',))
+    return cache.get_or_set(
+        f'posts_total:{generation}',
+        summed_count,
+        settings.FEED_PAGE_CACHE_TIMEOUT,
+    )
+
+
+def actual_counts(field):
+    """Реальное число постов по каждому автору или группе."""
+    rows = (
+        Post.objects.order_by()
+        .filter(**{f'{field}__isnull': False})
+        .values_list(field)
+        .annotate(posts_count=Count('pk'))
+    )
+    return dict(rows)
+
+
+@transaction.atomic
+def rebuild_counters():
+    """Пересчитывает все счётчики постов с нуля."""
+    for stats_model, field in COUNTERS:
+        stats_model.objects.all().delete()
+        stats_model.objects.bulk_create(
+            stats_model(**{f'{field}_id': key, 'posts_count': count})
+            for key, count in actual_counts(field).items()
+        )
+
+
+def find_mismatches():
+    """Список (модель, ключ, в счётчике, на самом деле) расхождений."""
+    mismatches = []
+    for stats_model, field in COUNTERS:
+        stored = dict(
+            stats_model.objects.exclude(posts_count=0)
+            .values_list('pk', 'posts_count')
+        )
+        actual = actual_counts(field)
+        for key in stored.keys() | actual.keys():
+            if stored.get(key, 0) != actual.get(key, 0):
+                mismatches.append((
+                    stats_model.__name__,
+                    key,
+                    stored.get(key, 0),
+                    actual.get(key, 0),
+                ))
+    return mismatches
@@ -5,6 +5,12 @@ from django.core.exceptions import ValidationError
 from .models import Post
 
 
+def validate_text(text):
+    """Проверка текста поста; её же проходят импортируемые посты."""
+    if not text:
+        raise ValidationError('This field is required')
+
+
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
@@ -12,9 +18,8 @@ class PostForm(forms.ModelForm):
 
     def clean_text(self):
         text = self.cleaned_data['text']
-        if text:
-            return text
-        raise ValidationError('This field is required')
+        validate_text(text)
+        return text
 
     def clean_group(self):
         group = self.cleaned_data['group']
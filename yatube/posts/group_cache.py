@@ -0,0 +1,178 @@
+# posts/group_cache.py
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import Http404
+
+from .models import Group, GroupStats
+from .page_cache import GLOBAL_SCOPE, bump, get_generations
+
+# Поколение групп в общем кэше: сдвигается при любом изменении групп
+GROUP_SCOPE = 'groups'
+FIELDS = [field.attname for field in Group._meta.concrete_fields]
+# К полям группы добавляется счётчик её постов
+COLUMNS = [*FIELDS, 'post_stats__posts_count']
+
+
+def remember(entries, key, value, size):
+    entries[key] = value
+    entries.move_to_end(key)
+    while len(entries) > size:
+        entries.popitem(last=False)
+
+
+def read_row(slug):
+    return Group.objects.filter(slug=slug).values_list(*COLUMNS).first()
+
+
+def stamp_path():
+    """Файл-отметка изменений групп, если общего кэша нет."""
+    return None if settings.SHARED_CACHE else settings.GROUP_CACHE_STAMP
+
+
+def write_stamp(path):
+    # Каждая отметка уникальна: два одновременных изменения групп не
+    # запишут одно и то же значение. os.replace атомарен, поэтому
+    # читатель не увидит недописанный файл
+    stamp = uuid.uuid4().hex
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f'{path}.{stamp}'
+    with open(temporary, 'w') as file:
+        file.write(stamp)
+    os.replace(temporary, path)
+    return stamp
+
+
+def read_stamp(path):
+    try:
+        with open(path) as file:
+            return file.read()
+    except FileNotFoundError:
+        return write_stamp(path)
+
+
+def bump_groups():
+    """Сбрасывает группы в памяти всех процессов."""
+    bump(GROUP_SCOPE)
+    path = stamp_path()
+    if path:
+        write_stamp(path)
+
+
+def bump_groups_on_commit():
+    """Как page_cache.bump_on_commit, но для групп в памяти процессов."""
+    bump_groups()
+    transaction.on_commit(bump_groups)
+
+
+class GroupCache:
+    """Группы по слагу в памяти процесса.
+
+    Найденные группы хранятся в LRU на GROUP_CACHE_SIZE слагов,
+    отсутствующие слаги — в отдельном LRU на GROUP_CACHE_MISSING_SIZE,
+    чтобы перебор случайных слагов не вытеснял настоящие группы. Перед
+    каждым чтением сверяется поколение GROUP_SCOPE в общем кэше: его
+    сдвигают сохранение и удаление групп в любом процессе. Вместе с
+    группой хранится число её постов; оно верно, пока не сдвинулись
+    поколения ленты группы и общей ленты.
+
+    Поколения видны другим процессам только через общий кэш. Без него
+    изменения групп отмечает файл settings.GROUP_CACHE_STAMP — общий
+    для процессов одной машины, но не разных, — а число постов не
+    кэшируется: stored_count прочитает его запросом. С ложным
+    settings.GROUP_CACHE группа читается из базы на каждом вызове.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = None
+        self.found = OrderedDict()
+        self.missing = OrderedDict()
+
+    def clear(self):
+        with self.lock:
+            self.generation = None
+            self.found.clear()
+            self.missing.clear()
+
+    def sync(self, slug):
+        """Поколение групп и поколения, от которых зависит счётчик."""
+        generation, *feeds = get_generations(
+            (GROUP_SCOPE, GLOBAL_SCOPE, f'group:{slug}')
+        )
+        path = stamp_path()
+        if path:
+            generation = (read_stamp(path), generation)
+        with self.lock:
+            if generation != self.generation:
+                self.found.clear()
+                self.missing.clear()
+                self.generation = generation
+        return generation, feeds
+
+    def lookup(self, slug):
+        """Строка группы со слагом slug; None, если группы нет."""
+        if not settings.GROUP_CACHE:
+            return read_row(slug)
+        generation, feeds = self.sync(slug)
+        with self.lock:
+            if slug in self.missing:
+                self.missing.move_to_end(slug)
+                return None
+            row, counted = self.found.get(slug, (None, None))
+            if counted == feeds:
+                self.found.move_to_end(slug)
+                return row
+        row = read_row(slug)
+        with self.lock:
+            # Группы могли измениться, пока шёл запрос
+            if generation != self.generation:
+                return row
+            if row is None:
+                remember(
+                    self.missing, slug, None,
+                    settings.GROUP_CACHE_MISSING_SIZE,
+                )
+            else:
+                remember(
+                    self.found, slug, (row, feeds), settings.GROUP_CACHE_SIZE
+                )
+        return row
+
+    def get(self, slug):
+        """Группа со слагом slug или None.
+
+        С общим кэшем счётчик постов уже загружен: stored_count(group)
+        не делает запроса.
+        """
+        row = self.lookup(slug)
+        if row is None:
+            return None
+        # Каждый вызов получает свой объект: кэшированные на нём связи
+        # не переживут запрос
+        *values, count = row
+        group = Group.from_db(DEFAULT_DB_ALIAS, FIELDS, values)
+        if settings.GROUP_CACHE and not settings.SHARED_CACHE:
+            # Изменения постов в других процессах здесь не видны
+            return group
+        # Группа без строки счётчика ещё без постов; None в кэше связи
+        # даёт в stored_count тот же DoesNotExist, что и запрос
+        group.post_stats = (
+            None if count is None
+            else GroupStats(group=group, posts_count=count)
+        )
+        return group
+
+
+groups = GroupCache()
+
+
+def get_group_or_404(slug):
+    group = groups.get(slug)
+    if group is None:
+        raise Http404('Нет такой группы')
+    return group
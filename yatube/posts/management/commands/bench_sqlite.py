@@ -0,0 +1,145 @@
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test.utils import override_settings
+
+from core.sqlite import is_busy
+from posts.models import Post
+
+User = get_user_model()
+
+BENCH_USERNAME = 'bench_writer'
+# Настройки без доработок из core/sqlite.py: журнал по умолчанию и
+# никаких повторов
+BASELINE = {
+    'SQLITE_PRAGMAS': {},
+    'SQLITE_BUSY_RETRIES': 0,
+    'SQLITE_IMMEDIATE_TRANSACTIONS': False,
+}
+# Процессам нужно время на запуск, чтобы начать одновременно
+START_DELAY = 0.5
+
+
+def run_worker(role, author_id, start, duration):
+    """Читает ленту или пишет посты до конца замера.
+
+    Возвращает роль, число выполненных операций и ошибок блокировки.
+    """
+    time.sleep(max(start - time.time(), 0))
+    deadline = start + duration
+    operations = errors = 0
+    while time.time() < deadline:
+        try:
+            if role == 'writer':
+                Post.objects.create(
+                    text='Пост из замера SQLite', author_id=author_id
+                )
+            else:
+                list(Post.objects.for_feed()[:settings.PAGINATOR_VALUE])
+            operations += 1
+        except OperationalError as error:
+            if not is_busy(error):
+                raise
+            errors += 1
+    connections.close_all()
+    return role, operations, errors
+
+
+def copy_database(source, journal_mode):
+    """Копия базы для замера, чтобы не писать в рабочую."""
+    descriptor, path = tempfile.mkstemp(suffix='.sqlite3')
+    os.close(descriptor)
+    with sqlite3.connect(source) as original:
+        copy = sqlite3.connect(path)
+        original.backup(copy)
+        copy.execute(f'PRAGMA journal_mode = {journal_mode}')
+        copy.close()
+    original.close()
+    return path
+
+
+def remove_database(path):
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность SQLite без настроек и с '
+        'настройками core/sqlite.py при конкурентных читателях и писателях'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument(
+            '--duration', type=float, default=5.0,
+            help='Длительность каждого замера в секундах',
+        )
+
+    def measure(self, source, journal_mode, overrides, options):
+        path = copy_database(source, journal_mode)
+        connections.close_all()
+        connection.settings_dict['NAME'] = path
+        try:
+            with override_settings(SLOW_QUERY_THRESHOLD=None, **overrides):
+                author, _ = User.objects.get_or_create(
+                    username=BENCH_USERNAME
+                )
+                # Процессы наследуют настройки, но не соединение
+                connections.close_all()
+                roles = (
+                    ['reader'] * options['readers']
+                    + ['writer'] * options['writers']
+                )
+                start = time.time() + START_DELAY
+                context = multiprocessing.get_context('fork')
+                with context.Pool(len(roles)) as pool:
+                    results = pool.starmap(run_worker, [
+                        (role, author.pk, start, options['duration'])
+                        for role in roles
+                    ])
+        finally:
+            connections.close_all()
+            connection.settings_dict['NAME'] = source
+            remove_database(path)
+        totals = {'reader': 0, 'writer': 0}
+        errors = 0
+        for role, operations, busy in results:
+            totals[role] += operations
+            errors += busy
+        return (
+            totals['reader'] / options['duration'],
+            totals['writer'] / options['duration'],
+            errors,
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Замер предназначен для SQLite')
+        source = connection.settings_dict['NAME']
+        if not os.path.exists(source):
+            raise CommandError(f'Нет файла базы {source}')
+        if not options['readers'] + options['writers']:
+            raise CommandError('Нужен хотя бы один читатель или писатель')
+        rows = (
+            ('без настроек', self.measure(
+                source, 'DELETE', BASELINE, options
+            )),
+            ('с настройками', self.measure(source, 'WAL', {}, options)),
+        )
+        self.stdout.write(
+            f'{"":<14}{"чтений/с":>12}{"записей/с":>12}{"блокировок":>12}'
+        )
+        for name, (reads, writes, errors) in rows:
+            self.stdout.write(
+                f'{name:<14}{reads:>12.1f}{writes:>12.1f}{errors:>12}'
+            )
@@ -0,0 +1,90 @@
+import csv
+import json
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from posts.api import API_FIELDS
+from posts.models import Post
+
+EXPORT_FIELDS = ('id', 'text', 'pub_date', 'author', 'group')
+FORMATS = ('ndjson', 'csv')
+
+
+class Echo:
+    """Файл, который возвращает записанную строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def parse_since(value):
+    """Дата или дата и время из --since как aware datetime."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты в NDJSON или CSV, не загружая их в память'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=FORMATS, default='ndjson',
+            help='Формат вывода',
+        )
+        parser.add_argument(
+            '--since',
+            help='Только посты, опубликованные с этой даты (ISO 8601)',
+        )
+        parser.add_argument('--group', help='Слаг группы')
+        parser.add_argument('--author', help='Имя пользователя автора')
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Сколько строк читать из базы за раз',
+        )
+
+    def get_queryset(self, options):
+        posts = Post.objects.order_by('pk')
+        if options['since']:
+            try:
+                posts = posts.filter(pub_date__gte=parse_since(
+                    options['since']
+                ))
+            except ValueError:
+                raise CommandError(f'Неверная дата: {options["since"]}')
+        if options['group']:
+            posts = posts.filter(group__slug=options['group'])
+        if options['author']:
+            posts = posts.filter(author__username=options['author'])
+        return posts.values_list(
+            *(API_FIELDS[name] for name in EXPORT_FIELDS)
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('Размер пачки должен быть больше нуля')
+        rows = self.get_queryset(options).iterator(
+            chunk_size=options['chunk_size']
+        )
+        if options['format'] == 'csv':
+            writer = csv.writer(Echo())
+            self.stdout.write(writer.writerow(EXPORT_FIELDS), ending='')
+            for row in rows:
+                self.stdout.write(writer.writerow(row), ending='')
+            return
+        for row in rows:
+            self.stdout.write(json.dumps(
+                dict(zip(EXPORT_FIELDS, row)),
+                cls=DjangoJSONEncoder,
+                ensure_ascii=False,
+            ))
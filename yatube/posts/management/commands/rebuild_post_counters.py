@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.counters import find_mismatches, rebuild_counters
+from posts.page_cache import GLOBAL_SCOPE, bump
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов авторов и групп'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только сверить счётчики с постами, ничего не меняя',
+        )
+
+    def handle(self, *args, **options):
+        if not options['check']:
+            rebuild_counters()
+            # Число постов групп хранится и в кэше групп процессов
+            bump(GLOBAL_SCOPE)
+            self.stdout.write(self.style.SUCCESS('Счётчики пересчитаны'))
+            return
+        mismatches = find_mismatches()
+        for model_name, key, stored, actual in mismatches:
+            self.stdout.write(
+                f'{model_name} {key}: в счётчике {stored}, постов {actual}'
+            )
+        if mismatches:
+            raise CommandError(f'Расхождений: {len(mismatches)}')
+        self.stdout.write(self.style.SUCCESS('Счётчики совпадают с постами'))
@@ -0,0 +1,313 @@
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from itertools import accumulate, chain
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+
+from posts.counters import rebuild_counters
+from posts.group_cache import bump_groups
+from posts.models import Group, Post
+from posts.page_cache import GLOBAL_SCOPE, bump
+from posts.search import (DROP_SEARCH_TRIGGERS, SEARCH_TRIGGERS,
+                          index_posts_after)
+
+User = get_user_model()
+
+WORDS = (
+    'день', 'город', 'вечер', 'друг', 'книга', 'море', 'дорога', 'дом',
+    'работа', 'время', 'мысль', 'окно', 'лето', 'зима', 'кошка', 'собака',
+    'новый', 'старый', 'большой', 'тихий', 'первый', 'последний', 'добрый',
+    'сегодня', 'вчера', 'снова', 'очень', 'почти', 'всегда', 'никогда',
+    'читать', 'писать', 'думать', 'гулять', 'ждать', 'смотреть', 'видеть',
+    'и', 'в', 'на', 'с', 'но', 'что', 'как', 'не', 'по', 'из', 'за',
+)
+# Тексты постов берутся из заранее собранного набора
+TEXT_POOL_SIZE = 5000
+# Параметры логнормального распределения длины поста в словах:
+# медиана около 20 слов, редкие посты в сотни слов
+TEXT_WORDS_MU = 3.0
+TEXT_WORDS_SIGMA = 1.0
+TEXT_WORDS_MAX = 1000
+# Доля постов вне групп
+NO_GROUP_SHARE = 0.2
+# Показатель степенного закона активности авторов и групп
+POWER_LAW_EXPONENT = 1.1
+INSERT_BATCH = 50000
+# Строк в одном INSERT для SQLite: по четыре параметра на строку, а
+# старые версии SQLite принимают не больше 999 параметров на запрос
+ROWS_PER_INSERT = 200
+# Доля новых постов, начиная с которой индексы таблицы перестраиваются
+REINDEX_SHARE = 0.1
+# Посты зерна N заканчиваются через N дней после этой даты: данные не
+# зависят от дня запуска. Середина года — чтобы год постов, как и на
+# живом сайте, захватывал два календарных года (иерархия дат в админке
+# и базовые замеры производительности рассчитаны на это)
+SEED_EPOCH = datetime(2020, 7, 1, tzinfo=dt_timezone.utc)
+
+
+def power_law_weights(count, exponent=POWER_LAW_EXPONENT, start=0):
+    """Накопленные веса закона Ципфа: k-й по рангу получает 1 / k^a."""
+    weights = accumulate(1 / rank ** exponent for rank in range(1, count + 1))
+    return [start + weight for weight in weights]
+
+
+def make_texts(rng):
+    texts = []
+    for _ in range(TEXT_POOL_SIZE):
+        words = min(
+            max(int(rng.lognormvariate(TEXT_WORDS_MU, TEXT_WORDS_SIGMA)), 1),
+            TEXT_WORDS_MAX,
+        )
+        text = ' '.join(rng.choices(WORDS, k=words))
+        texts.append(text[0].upper() + text[1:] + '.')
+    return texts
+
+
+def seed_end(seed):
+    return SEED_EPOCH + timedelta(days=seed)
+
+
+def post_rows(rng, count, author_ids, group_ids, end, days):
+    """Строки (текст, автор, группа, дата) пачками по INSERT_BATCH.
+
+    Даты идут по возрастанию, как при настоящей публикации, за days
+    дней до end. Дата передаётся меткой времени Unix: строку из неё
+    собирает база (см. Command.insert_posts), в Python это основная
+    доля времени на миллионах постов.
+    """
+    texts = make_texts(rng)
+    author_weights = power_law_weights(len(author_ids))
+    # Посты без группы — ещё один вариант с долей NO_GROUP_SHARE
+    group_total = power_law_weights(len(group_ids))[-1]
+    no_group = group_total * NO_GROUP_SHARE / (1 - NO_GROUP_SHARE)
+    group_weights = [
+        no_group,
+        *power_law_weights(len(group_ids), start=no_group),
+    ]
+    group_ids = [None, *group_ids]
+    step = days * 24 * 60 * 60 / max(count, 1)
+    start = end.timestamp() - days * 24 * 60 * 60
+    jitter = rng.random
+    for offset in range(0, count, INSERT_BATCH):
+        size = min(INSERT_BATCH, count - offset)
+        # Строки собираются через zip без цикла по каждой строке
+        moments = [
+            start + (number + jitter()) * step
+            for number in range(offset, offset + size)
+        ]
+        yield list(zip(
+            rng.choices(texts, k=size),
+            rng.choices(author_ids, cum_weights=author_weights, k=size),
+            rng.choices(group_ids, cum_weights=group_weights, k=size),
+            moments,
+        ))
+
+
+def datetime_rows(batches):
+    """Пачки строк с датой datetime вместо метки времени."""
+    for batch in batches:
+        rows = []
+        for text, author, group, moment in batch:
+            moment = datetime.fromtimestamp(moment, dt_timezone.utc)
+            rows.append((text, author, group, moment, moment))
+        yield rows
+
+
+def sqlite_statements(batches):
+    """Пачки параметров многострочных INSERT: (число строк, параметры).
+
+    Один запрос на ROWS_PER_INSERT строк обходится SQLite почти вдвое
+    дешевле, чем executemany по строке.
+    """
+    for batch in batches:
+        full = len(batch) - len(batch) % ROWS_PER_INSERT
+        if full:
+            yield ROWS_PER_INSERT, [
+                list(chain.from_iterable(batch[start:start + ROWS_PER_INSERT]))
+                for start in range(0, full, ROWS_PER_INSERT)
+            ]
+        if full < len(batch):
+            tail = list(chain.from_iterable(batch[full:]))
+            yield len(batch) - full, [tail]
+
+
+def sqlite_insert(head, size):
+    """INSERT size постов одним запросом.
+
+    SQLite-бэкенд хранит время в UTC строкой вида str(datetime), и
+    даты сравниваются как текст, поэтому строка собирается в базе точно
+    в этом виде: шесть знаков микросекунд, без дробной части при нуле.
+    Секунды берутся от целой части метки: strftime округляет время до
+    миллисекунд и мог бы перенести его в следующую секунду.
+    """
+    values = ', '.join(['(%s, %s, %s, %s)'] * size)
+    return (
+        f'{head} SELECT column1, column2, column3, moment, moment, 0 '
+        f"FROM (SELECT *, strftime('%%Y-%%m-%%d %%H:%%M:%%S', seconds, "
+        f"'unixepoch') || CASE micro WHEN 0 THEN '' "
+        f"ELSE printf('.%%06d', micro) END AS moment "
+        f'FROM (SELECT *, CAST((column4 - seconds) * 1000000 AS INTEGER) '
+        f'AS micro FROM (SELECT *, CAST(column4 AS INTEGER) AS seconds '
+        f'FROM (VALUES {values}))))'
+    )
+
+
+def prefetched(batches):
+    """Пачки, следующая из которых готовится в потоке.
+
+    Пока база вставляет одну пачку (sqlite3 отпускает GIL на время
+    запроса), поток собирает следующую.
+    """
+    with ThreadPoolExecutor(1) as pool:
+        future = pool.submit(next, batches, None)
+        while True:
+            batch = future.result()
+            if batch is None:
+                return
+            future = pool.submit(next, batches, None)
+            yield batch
+
+
+def drop_post_indexes(cursor):
+    """Удаляет вторичные индексы таблицы постов и возвращает их SQL.
+
+    Индексы известны только SQLite-схеме; на других базах они остаются
+    на месте, и вставка просто идёт медленнее.
+    """
+    if connection.vendor != 'sqlite':
+        return []
+    cursor.execute(
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL",
+        [Post._meta.db_table],
+    )
+    indexes = cursor.fetchall()
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+    return [sql for _, sql in indexes]
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу синтетическими пользователями, группами и постами'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='На сколько дней растянуть даты постов',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Зерно генератора: одно зерно — одни и те же данные',
+        )
+
+    def create_users(self, count, seed):
+        # Пароль «!» — неиспользуемый, без медленного хеширования
+        users = [
+            User(username=f'user_{seed}_{number}', password='!')
+            for number in range(count)
+        ]
+        User.objects.bulk_create(users)
+        return list(
+            User.objects.filter(username__startswith=f'user_{seed}_')
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def create_groups(self, rng, count, seed):
+        groups = [
+            Group(
+                title=f'Группа {seed}-{number}',
+                slug=f'group-{seed}-{number}',
+                description=' '.join(rng.choices(WORDS, k=12)),
+            )
+            for number in range(count)
+        ]
+        Group.objects.bulk_create(groups)
+        return list(
+            Group.objects.filter(slug__startswith=f'group-{seed}-')
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def insert_posts(self, rng, count, author_ids, group_ids, end, days):
+        """Вставляет посты многострочными INSERT в обход моделей."""
+        opts = Post._meta
+        columns = ('text', 'author', 'group', 'pub_date', 'updated_at',
+                   'version')
+        head = 'INSERT INTO {} ({})'.format(
+            connection.ops.quote_name(opts.db_table),
+            ', '.join(
+                connection.ops.quote_name(opts.get_field(name).column)
+                for name in columns
+            ),
+        )
+        rows = post_rows(rng, count, author_ids, group_ids, end, days)
+        if connection.vendor == 'sqlite':
+            statements = prefetched(sqlite_statements(rows))
+        else:
+            sql = f'{head} VALUES (%s, %s, %s, %s, %s, 0)'
+            statements = (
+                (sql, batch) for batch in prefetched(datetime_rows(rows))
+            )
+        with connection.cursor() as cursor:
+            for sql, params in statements:
+                if isinstance(sql, int):
+                    sql = sqlite_insert(head, sql)
+                cursor.executemany(sql, params)
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['groups']) < 1:
+            raise CommandError('Нужен хотя бы один автор и одна группа')
+        if User.objects.filter(
+            username__startswith=f'user_{options["seed"]}_'
+        ).exists():
+            raise CommandError(
+                f'Данные с зерном {options["seed"]} уже есть, '
+                'укажите другое --seed'
+            )
+        rng = random.Random(options['seed'])
+        started = time.monotonic()
+        with transaction.atomic():
+            author_ids = self.create_users(options['users'], options['seed'])
+            group_ids = self.create_groups(
+                rng, options['groups'], options['seed']
+            )
+            last_pk = Post.objects.aggregate(last=Max('pk'))['last'] or 0
+            # Индексы и FTS5 дешевле построить один раз по готовым
+            # строкам, чем обновлять на каждой вставке. Индексы таблицы
+            # строятся по всем постам, поэтому перестраиваются, только
+            # если новых постов заметная доля
+            with connection.cursor() as cursor:
+                for statement in DROP_SEARCH_TRIGGERS:
+                    cursor.execute(statement)
+                indexes = []
+                if options['posts'] > Post.objects.count() * REINDEX_SHARE:
+                    indexes = drop_post_indexes(cursor)
+            posts_started = time.monotonic()
+            self.insert_posts(
+                rng, options['posts'], author_ids, group_ids,
+                seed_end(options['seed']), options['days'],
+            )
+            posts_time = time.monotonic() - posts_started
+            with connection.cursor() as cursor:
+                for statement in indexes + SEARCH_TRIGGERS:
+                    cursor.execute(statement)
+            index_posts_after(last_pk)
+            rebuild_counters()
+        bump(GLOBAL_SCOPE, 'index')
+        bump_groups()
+        rate = options['posts'] / posts_time if posts_time else math.inf
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: пользователей {options["users"]}, '
+            f'групп {options["groups"]}, постов {options["posts"]} '
+            f'за {time.monotonic() - started:.1f} с '
+            f'(вставка постов: {rate:,.0f} в секунду)'
+        ))
@@ -0,0 +1,45 @@
+# Generated by Django 2.2.16 on 2026-10-18 04:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+import posts.models
+from posts.search import DROP_SEARCH_TRIGGERS, SEARCH_TRIGGERS
+
+CREATE_INDEX = [
+    """
+    CREATE VIRTUAL TABLE posts_post_fts USING fts5(
+        text, content='posts_post', content_rowid='id'
+    )
+    """,
+    *SEARCH_TRIGGERS,
+    "INSERT INTO posts_post_fts(posts_post_fts) VALUES ('rebuild')",
+]
+
+DROP_INDEX = [
+    *DROP_SEARCH_TRIGGERS,
+    'DROP TABLE IF EXISTS posts_post_fts',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_post_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostIndex',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='posts.Post')),
+                ('text', posts.models.SearchTextField()),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'posts_post_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(CREATE_INDEX, DROP_INDEX),
+    ]
@@ -1,9 +1,34 @@
 # posts/models.py
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Lookup
 
 User = get_user_model()
 
+# Поля, которые выводит карточка поста в лентах
+FEED_FIELDS = (
+    'text',
+    'pub_date',
+    'version',
+    'author__username',
+    'author__first_name',
+    'author__last_name',
+    'group__title',
+    'group__slug',
+)
+
+
+class PostQuerySet(models.QuerySet):
+    def for_feed(self):
+        """Посты вместе с автором и группой одним запросом."""
+        return self.select_related('author', 'group').only(*FEED_FIELDS)
+
+    def for_detail(self):
+        """Пост для страницы записи вместе со счётчиком постов автора."""
+        return self.select_related(
+            'author__post_stats', 'group'
+        ).only(*FEED_FIELDS, 'author__post_stats__posts_count')
+
 
 class Group(models.Model):
     title = models.CharField('Заголовок', max_length=200)
@@ -21,6 +46,7 @@ class Group(models.Model):
 class Post(models.Model):
     text = models.TextField('Содержание')
     pub_date = models.DateTimeField('Дата публикации', auto_now_add=True)
+    updated_at = models.DateTimeField('Дата изменения', auto_now=True)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -35,11 +61,122 @@ class Post(models.Model):
         null=True,
         verbose_name='Сообщество',
     )
+    # Растёт при каждом сохранении; входит в ключи кэша карточек поста
+    version = models.PositiveIntegerField(
+        'Версия', default=0, editable=False
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
+        # Индексы повторяют порядок лент, чтобы SQLite не сортировал выборку
+        indexes = (
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=('group', '-pub_date', '-id'),
+                name='post_group_feed_idx',
+            ),
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_feed_idx',
+            ),
+            # Для валидаторов условных запросов: MAX(updated_at) ленты
+            models.Index(
+                fields=('author', 'updated_at'),
+                name='post_author_updated_idx',
+            ),
+            models.Index(
+                fields=('group', 'updated_at'),
+                name='post_group_updated_idx',
+            ),
+            models.Index(fields=('updated_at',), name='post_updated_idx'),
+        )
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
 
     def __str__(self):
         return self.text[:15]
+
+    def save(self, *args, **kwargs):
+        self.version += 1
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {
+                *kwargs['update_fields'], 'version', 'updated_at'
+            }
+        # Счётчики постов обновляются сигналами в той же транзакции
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class AuthorStats(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_stats',
+        verbose_name='Автор',
+    )
+    posts_count = models.PositiveIntegerField('Число постов', default=0)
+
+    class Meta:
+        verbose_name = 'Статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return f'{self.author_id}: {self.posts_count}'
+
+
+class GroupStats(models.Model):
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_stats',
+        verbose_name='Группа',
+    )
+    posts_count = models.PositiveIntegerField('Число постов', default=0)
+
+    class Meta:
+        verbose_name = 'Статистика группы'
+        verbose_name_plural = 'Статистика групп'
+
+    def __str__(self):
+        return f'{self.group_id}: {self.posts_count}'
+
+
+class SearchTextField(models.TextField):
+    """Колонка FTS5, поддерживающая поиск через __match."""
+
+
+@SearchTextField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class PostIndex(models.Model):
+    """Полнотекстовый индекс постов (виртуальная таблица FTS5).
+
+    Таблица создаётся миграцией и заполняется триггерами на posts_post.
+    """
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        related_name='search_index',
+    )
+    text = SearchTextField()
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'posts_post_fts'
@@ -0,0 +1,116 @@
+# posts/page_cache.py
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+GLOBAL_SCOPE = 'all'
+# Заголовки ответа, которые хранятся вместе со страницей
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def generation_key(scope):
+    return f'feed_generation:{scope}'
+
+
+def get_generations(scopes):
+    """Текущие поколения лент; отсутствующие заводятся заново.
+
+    Новое поколение берётся из часов, а не с нуля, чтобы после вытеснения
+    счётчика из кэша старые страницы не совпали с новыми ключами.
+    """
+    keys = [generation_key(scope) for scope in scopes]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time_ns(), None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump(*scopes):
+    """Сдвигает поколения лент, делая их закэшированные страницы старыми."""
+    for scope in scopes:
+        key = generation_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def bump_on_commit(*scopes):
+    """Сдвигает поколения сейчас и ещё раз после фиксации транзакции.
+
+    Второй сдвиг отбрасывает страницы, закэшированные конкурентными
+    запросами, пока транзакция не была зафиксирована.
+    """
+    bump(*scopes)
+    transaction.on_commit(lambda: bump(*scopes))
+
+
+def is_cacheable(request):
+    # Без сессионной куки пользователь точно анонимный, и проверка
+    # не требует обращения к базе
+    return (
+        settings.FEED_PAGE_CACHE
+        and request.method in ('GET', 'HEAD')
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+    )
+
+
+def cached_response(request, content, headers):
+    """Ответ из кэша, в том числе 304 по сохранённым валидаторам."""
+    response = HttpResponse(content)
+    for header, value in headers.items():
+        response[header] = value
+    return get_conditional_response(
+        request,
+        etag=response.get('ETag'),
+        last_modified=parse_http_date_safe(response.get('Last-Modified')),
+        response=response,
+    )
+
+
+def anonymous_page_cache(scope, kwarg=None):
+    """Кэширует страницу ленты для анонимных читателей.
+
+    Ключ страницы включает полный URL и поколения ленты scope (с
+    уточнением по аргументу URL kwarg) и общей ленты; изменение постов
+    сдвигает поколения вместо ожидания истечения кэша.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not is_cacheable(request):
+                return view(request, *args, **kwargs)
+            feed = f'{scope}:{kwargs[kwarg]}' if kwarg else scope
+            generations = get_generations((GLOBAL_SCOPE, feed))
+            path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            key = 'feed_page:{}:{}:{}'.format(
+                feed, path, ':'.join(map(str, generations))
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                return cached_response(request, *cached)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                headers = {
+                    header: response[header]
+                    for header in CACHED_HEADERS if response.has_header(header)
+                }
+                cache.set(
+                    key,
+                    (response.content, headers),
+                    settings.FEED_PAGE_CACHE_TIMEOUT,
+                )
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,335 @@
+# posts/paginators.py
+import base64
+import binascii
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from .counters import total_count
+
+FEED_ORDERING = ('-pub_date', '-id')
+CURSOR_SEPARATOR = '|'
+CURSOR_MODE = 'cursor'
+# Наибольшее значение INTEGER в SQLite: id и OFFSET больше него не
+# передать в запрос
+MAX_SQL_INTEGER = 2 ** 63 - 1
+# Сколько ссылок на страницы показывать вокруг текущей и на краях ленты
+PAGE_LINKS_AROUND = 2
+PAGE_LINKS_AT_ENDS = 1
+
+
+def encode_cursor(pub_date, pk):
+    """Упаковывает ключ (pub_date, id) в непрозрачный токен для URL."""
+    raw = f'{pub_date.isoformat()}{CURSOR_SEPARATOR}{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Возвращает (pub_date, id) из токена или None, если токен битый."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        pub_date, pk = raw.rsplit(CURSOR_SEPARATOR, 1)
+        pub_date, pk = parse_datetime(pub_date), int(pk)
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        return None
+    if pub_date is None or not 1 <= pk <= MAX_SQL_INTEGER:
+        return None
+    return pub_date, pk
+
+
+def row_key(row):
+    """Ключ (pub_date, id) поста или словаря из values('pub_date', 'pk')."""
+    if isinstance(row, dict):
+        return row['pub_date'], row['pk']
+    return row.pub_date, row.pk
+
+
+class CursorPage(Page):
+    """Страница ленты, адресуемая курсором, а не номером.
+
+    Номер страницы и общее число страниц неизвестны: их подсчёт требует
+    COUNT(*) и OFFSET, от которых курсорная пагинация и избавляет.
+    """
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, cursor=None,
+                 has_next=False, has_previous=False):
+        super().__init__(object_list, None, paginator)
+        self.cursor = cursor
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<Cursor page {self.cursor or "first"}>'
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self.object_list:
+            return self.cursor
+        return encode_cursor(*row_key(self.object_list[-1]))
+
+    @property
+    def previous_cursor(self):
+        if not self.object_list:
+            return self.cursor
+        return encode_cursor(*row_key(self.object_list[0]))
+
+
+class CursorPaginator(Paginator):
+    """Keyset-пагинатор по ключу (pub_date, id).
+
+    Каждая страница — один запрос с условием на ключ и LIMIT per_page + 1,
+    поэтому её стоимость не зависит от глубины.
+    """
+
+    def __init__(self, object_list, per_page, **kwargs):
+        super().__init__(
+            object_list.order_by(*FEED_ORDERING), per_page, **kwargs
+        )
+
+    def keyset_queryset(self, position=None, backwards=False):
+        """Строки страницы после ключа position (или до него)."""
+        queryset = self.object_list
+        if position is not None:
+            pub_date, pk = position
+            # Избыточное условие на pub_date даёт SQLite диапазон для
+            # поиска по индексу; без него OR читает ленту с начала.
+            if backwards:
+                queryset = queryset.filter(pub_date__gte=pub_date).filter(
+                    Q(pub_date__gt=pub_date) | Q(pk__gt=pk)
+                ).reverse()
+            else:
+                queryset = queryset.filter(pub_date__lte=pub_date).filter(
+                    Q(pub_date__lt=pub_date) | Q(pk__lt=pk)
+                )
+        return queryset[:self.per_page + 1]
+
+    def get_cursor_page(self, after=None, before=None):
+        position = decode_cursor(before) if before else None
+        if position is not None:
+            rows = list(self.keyset_queryset(position, backwards=True))
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            rows.reverse()
+            return CursorPage(
+                rows,
+                self,
+                cursor=before,
+                has_next=True,
+                has_previous=has_previous,
+            )
+        position = decode_cursor(after) if after else None
+        rows = list(self.keyset_queryset(position))
+        return CursorPage(
+            rows[:self.per_page],
+            self,
+            cursor=after if position is not None else None,
+            has_next=len(rows) > self.per_page,
+            has_previous=position is not None,
+        )
+
+    def cursor_for_page(self, number):
+        """Токен `after` для начала страницы с номером number.
+
+        Нужен только для перевода старых ссылок ?page=N, поэтому один
+        OFFSET-запрос здесь допустим.
+        """
+        if number <= 1:
+            return None
+        offset = (number - 1) * self.per_page - 1
+        if offset >= MAX_SQL_INTEGER:
+            return None
+        row = self.object_list.values_list('pub_date', 'pk')[
+            offset:offset + 1
+        ]
+        row = list(row)
+        return encode_cursor(*row[0]) if row else None
+
+
+class FeedPage(Page):
+    """Страница ленты с сокращённым списком ссылок на другие страницы."""
+
+    @cached_property
+    def page_links(self):
+        return self.paginator.get_elided_page_range(self.number)
+
+
+class EstimatedPage(FeedPage):
+    """Страница ленты, общее число постов в которой неизвестно.
+
+    Наличие следующей страницы определяется лишней строкой в выборке.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next=False):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1
+
+
+class CountedPaginator(Paginator):
+    """Пагинатор без COUNT(*) по всей ленте.
+
+    Число постов передаётся из счётчиков (count). Если его нет, считается
+    не больше settings.FEED_COUNT_LIMIT строк; когда постов больше,
+    пагинатор переходит в режим «много страниц» (many_pages): общее число
+    страниц не показывается, а следующая страница ищется лишней строкой.
+    """
+    ELLIPSIS = '…'
+    many_pages = False
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.known_count = count
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            return self.known_count
+        limit = settings.FEED_COUNT_LIMIT
+        # Порядок для подсчёта не нужен, а у поиска он ранжирует все
+        # совпадения через bm25
+        count = self.object_list.order_by()[:limit + 1].count()
+        if count > limit:
+            self.many_pages = True
+            return limit
+        return count
+
+    def validate_number(self, number):
+        # Подсчёт определяет режим пагинатора, поэтому идёт первым
+        self.count
+        if not self.many_pages:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы не целое число')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1')
+        # Конец ленты неизвестен, но OFFSET страницы должен уместиться
+        # в INTEGER, иначе запрос упадёт с ошибкой базы
+        if number * self.per_page >= MAX_SQL_INTEGER:
+            raise EmptyPage('На странице нет результатов')
+        return number
+
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
+
+    def get_elided_page_range(self, number=1, on_each_side=PAGE_LINKS_AROUND,
+                              on_ends=PAGE_LINKS_AT_ENDS):
+        """Номера страниц для навигации: края ленты и окно вокруг number.
+
+        Пропуски обозначаются ELLIPSIS, поэтому ссылок не больше
+        2 * (on_ends + on_each_side) + 1 при любом размере ленты. В режиме
+        «много страниц» конец ленты неизвестен и всегда заменён пропуском.
+        """
+        last = max(self.num_pages, number)
+        pages = set(range(number - on_each_side, number + on_each_side + 1))
+        pages.update(range(1, on_ends + 1))
+        if not self.many_pages:
+            pages.update(range(last - on_ends + 1, last + 1))
+        links = []
+        previous = 0
+        for page in sorted(page for page in pages if 1 <= page <= last):
+            if page - previous == 2:
+                # Пропуск в одну страницу не короче её номера
+                links.append(previous + 1)
+            elif page - previous > 2:
+                links.append(self.ELLIPSIS)
+            links.append(page)
+            previous = page
+        if self.many_pages:
+            links.append(self.ELLIPSIS)
+        return links
+
+    def get_page(self, number):
+        try:
+            return super().get_page(number)
+        except EmptyPage:
+            # В режиме «много страниц» номер за концом ленты выясняется
+            # только выборкой; показываем последнюю известную страницу
+            return self.page(self.num_pages)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.many_pages:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows:
+            raise EmptyPage('На странице нет результатов')
+        return EstimatedPage(
+            rows[:self.per_page],
+            number,
+            self,
+            has_next=len(rows) > self.per_page,
+        )
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор списка постов в админке без COUNT(*) по всей таблице.
+
+    Без фильтров число постов берётся из счётчиков авторов, с фильтрами
+    считается не больше settings.ADMIN_COUNT_LIMIT строк; страницы
+    дальше лимита не показываются.
+    """
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.has_filters():
+            return total_count()
+        # Порядок не влияет на число строк, а сортировка по рангу
+        # поиска в подзапросе дороже самого подсчёта
+        limited = self.object_list.order_by()[:settings.ADMIN_COUNT_LIMIT]
+        return limited.count()
+
+
+def paginate(request, post_list, count=None):
+    """Страница ленты в режиме, заданном settings.FEED_PAGINATION.
+
+    count — число постов ленты из счётчиков, если оно известно.
+    """
+    if settings.FEED_PAGINATION == CURSOR_MODE:
+        paginator = CursorPaginator(post_list, settings.PAGINATOR_VALUE)
+        return paginator.get_cursor_page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
+    paginator = CountedPaginator(
+        post_list, settings.PAGINATOR_VALUE, count=count
+    )
+    return paginator.get_page(request.GET.get('page'))
+
+
+def legacy_page_url(request, post_list):
+    """URL с курсором для старой ссылки ?page=N в курсорном режиме.
+
+    Возвращает None, если перенаправление не требуется.
+    """
+    if (settings.FEED_PAGINATION != CURSOR_MODE
+            or 'page' not in request.GET):
+        return None
+    try:
+        number = int(request.GET['page'])
+    except ValueError:
+        number = 1
+    paginator = CursorPaginator(post_list, settings.PAGINATOR_VALUE)
+    token = paginator.cursor_for_page(number)
+    if token is None:
+        return request.path
+    return f'{request.path}?{urlencode({"after": token})}'
@@ -0,0 +1,87 @@
+# posts/search.py
+from django.db import connection, connections
+
+# Триггеры, которые держат индекс posts_post_fts в синхронизации с постами
+SEARCH_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_post_fts_insert
+    AFTER INSERT ON posts_post BEGIN
+        INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_post_fts_delete
+    AFTER DELETE ON posts_post BEGIN
+        INSERT INTO posts_post_fts(posts_post_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_post_fts_update
+    AFTER UPDATE OF text ON posts_post BEGIN
+        INSERT INTO posts_post_fts(posts_post_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+]
+
+DROP_SEARCH_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS posts_post_fts_update',
+    'DROP TRIGGER IF EXISTS posts_post_fts_delete',
+    'DROP TRIGGER IF EXISTS posts_post_fts_insert',
+]
+
+
+def fts_query(text):
+    """Запрос FTS5 из пользовательского ввода: все слова, как фразы.
+
+    Кавычки экранируются, поэтому синтаксис FTS5 во вводе не работает
+    и не может вызвать ошибку разбора запроса.
+    """
+    return ' '.join(
+        '"{}"'.format(word.replace('"', '""')) for word in text.split()
+    )
+
+
+def search_posts(queryset, text):
+    """Посты, подходящие под запрос, от наиболее релевантных по bm25."""
+    query = fts_query(text)
+    if not query:
+        return queryset.none()
+    return queryset.filter(search_index__text__match=query).order_by(
+        'search_index__rank', '-pub_date', '-id'
+    )
+
+
+def rebuild_index():
+    """Перестраивает полнотекстовый индекс по таблице постов."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO posts_post_fts(posts_post_fts) VALUES ('rebuild')"
+        )
+
+
+def index_posts_after(pk):
+    """Добавляет в индекс посты с id больше pk, вставленные без триггеров."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO posts_post_fts(rowid, text) '
+            'SELECT id, text FROM posts_post WHERE id > %s',
+            [pk],
+        )
+
+
+def restore_search_triggers(using='default', **kwargs):
+    """Создаёт триггеры индекса, если их нет.
+
+    SQLite-миграции, меняющие posts_post, пересоздают таблицу и теряют
+    её триггеры, поэтому после каждого migrate они создаются заново.
+    """
+    connection = connections[using]
+    tables = connection.introspection.table_names()
+    if 'posts_post' not in tables or 'posts_post_fts' not in tables:
+        return
+    with connection.cursor() as cursor:
+        for statement in SEARCH_TRIGGERS:
+            cursor.execute(statement)
@@ -0,0 +1,97 @@
+# posts/signals.py
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from .counters import COUNTERS, change_count
+from .group_cache import bump_groups_on_commit
+from .models import Group, Post
+from .page_cache import GLOBAL_SCOPE, bump_on_commit
+
+User = get_user_model()
+
+COUNTED_FIELDS = tuple(f'{field}_id' for _, field in COUNTERS)
+
+
+def remember_counted(instance):
+    """Запоминает автора и группу, под которыми пост учтён в счётчиках."""
+    instance._counted = {
+        field: instance.__dict__.get(field) for field in COUNTED_FIELDS
+    }
+
+
+@receiver(post_init, sender=Post)
+def post_loaded(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._counted = dict.fromkeys(COUNTED_FIELDS)
+        return
+    deferred = instance.get_deferred_fields()
+    if any(field in deferred for field in COUNTED_FIELDS):
+        # Значения подгрузятся перед сохранением, см. post_saving
+        instance._counted = None
+        return
+    remember_counted(instance)
+
+
+@receiver(pre_save, sender=Post)
+def post_saving(sender, instance, **kwargs):
+    if instance._state.adding or instance._counted is not None:
+        return
+    instance._counted = (
+        Post.objects.filter(pk=instance.pk)
+        .values(*COUNTED_FIELDS)
+        .first()
+    ) or dict.fromkeys(COUNTED_FIELDS)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    counted = instance._counted
+    if created:
+        counted = dict.fromkeys(COUNTED_FIELDS)
+    for stats_model, field in COUNTERS:
+        old = counted[f'{field}_id']
+        new = getattr(instance, f'{field}_id')
+        if old != new:
+            change_count(stats_model, old, -1)
+            change_count(stats_model, new, 1)
+    bump_post_feeds(instance, {counted['group_id'], instance.group_id})
+    remember_counted(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    for stats_model, field in COUNTERS:
+        change_count(stats_model, getattr(instance, f'{field}_id'), -1)
+    bump_post_feeds(instance, {instance.group_id})
+
+
+def bump_post_feeds(post, group_ids):
+    """Устаревают кэши лент, где пост был или стал виден."""
+    slugs = Group.objects.filter(pk__in=group_ids - {None}).values_list(
+        'slug', flat=True
+    )
+    bump_on_commit(
+        'index',
+        f'author:{post.author.username}',
+        *(f'group:{slug}' for slug in slugs),
+    )
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, **kwargs):
+    # Слаг группы выводится в карточках всех лент; группы в памяти
+    # процессов (posts/group_cache.py) сбрасываются отдельно
+    bump_on_commit(GLOBAL_SCOPE)
+    bump_groups_on_commit()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, update_fields=None, **kwargs):
+    # Вход пользователя сохраняет только last_login и ленты не меняет
+    shown = {'username', 'first_name', 'last_name'}
+    if update_fields is None or shown & set(update_fields):
+        bump_on_commit(GLOBAL_SCOPE)
@@ -0,0 +1 @@
+# posts/templatetags/__init__.py
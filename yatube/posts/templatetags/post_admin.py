@@ -0,0 +1,106 @@
+# posts/templatetags/post_admin.py
+from datetime import datetime, timedelta
+
+from django import template
+from django.conf import settings
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.db.models import Max, Min
+from django.utils import timezone
+
+register = template.Library()
+
+
+def period_start(moment, kind):
+    """Начало года, месяца или дня, в который попадает moment."""
+    if settings.USE_TZ:
+        moment = timezone.localtime(moment)
+    start = datetime(
+        moment.year,
+        1 if kind == 'year' else moment.month,
+        moment.day if kind == 'day' else 1,
+    )
+    return timezone.make_aware(start) if settings.USE_TZ else start
+
+
+def next_period(start, kind):
+    if kind == 'year':
+        naive = datetime(start.year + 1, 1, 1)
+    elif kind == 'month':
+        naive = datetime(
+            start.year + start.month // 12, start.month % 12 + 1, 1
+        )
+    else:
+        naive = datetime(start.year, start.month, start.day) + timedelta(1)
+    return timezone.make_aware(naive) if settings.USE_TZ else naive
+
+
+def date_bounds(queryset, field, searched=False):
+    """Первая и последняя дата выборки.
+
+    SQLite находит по индексу только одиночный MIN или MAX, поэтому
+    обычно это два запроса. Результаты поиска индекс дат не сужает,
+    и для них один проход по найденному дешевле двух.
+    """
+    if searched:
+        bounds = queryset.aggregate(first=Min(field), last=Max(field))
+        return bounds['first'], bounds['last']
+    first = queryset.aggregate(first=Min(field))['first']
+    if first is None:
+        return None, None
+    return first, queryset.aggregate(last=Max(field))['last']
+
+
+def indexed_dates(queryset, field, kind, bounds=None):
+    """Периоды, за которые в выборке есть записи, как у QuerySet.dates.
+
+    Вместо DISTINCT по всем строкам выборки берутся первая и последняя
+    дата (bounds, если уже известны), а каждый период между ними
+    проверяется EXISTS по диапазону field — это поиск по индексу.
+    """
+    first, last = bounds or date_bounds(queryset, field)
+    if first is None:
+        return []
+    start = period_start(first, kind)
+    final = period_start(last, kind)
+    # Периоды первой и последней даты заведомо не пусты
+    known = {start, final}
+    dates = []
+    while start <= final:
+        end = next_period(start, kind)
+        if start in known or queryset.filter(
+            **{f'{field}__gte': start, f'{field}__lt': end}
+        ).exists():
+            dates.append(start.date())
+        start = end
+    return dates
+
+
+class IndexedDateQuerySet:
+    """Выборка для тега date_hierarchy с запросами по индексу дат.
+
+    Тег запрашивает только MIN и MAX поля и dates(); границы дат
+    считаются один раз на отрисовку.
+    """
+
+    def __init__(self, queryset, field, searched=False):
+        self.queryset = queryset
+        self.bounds = date_bounds(queryset, field, searched)
+
+    def aggregate(self, first, last):
+        return dict(zip(('first', 'last'), self.bounds))
+
+    def dates(self, field, kind, order='ASC'):
+        return indexed_dates(self.queryset, field, kind, self.bounds)
+
+
+@register.inclusion_tag('admin/date_hierarchy.html')
+def indexed_date_hierarchy(cl):
+    """date_hierarchy админки без DISTINCT по всем датам выборки."""
+    queryset = cl.queryset
+    cl.queryset = IndexedDateQuerySet(
+        queryset, cl.date_hierarchy, searched=bool(cl.query)
+    )
+    try:
+        return date_hierarchy(cl)
+    finally:
+        cl.queryset = queryset
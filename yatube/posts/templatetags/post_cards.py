@@ -0,0 +1,45 @@
+# posts/templatetags/post_cards.py
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+register = template.Library()
+
+CARD_TEMPLATE = 'posts/includes/post_card.html'
+
+
+def card_cache_key(post):
+    """Ключ кэша карточки: меняется вместе с любыми выводимыми данными.
+
+    Версия поста растёт при каждом сохранении, а имя автора и слаг группы
+    попадают в ключ, чтобы их правка не оставляла устаревших карточек.
+    """
+    author = post.author
+    parts = (
+        post.pk,
+        post.version,
+        post.pub_date.isoformat(),
+        author.username,
+        author.first_name,
+        author.last_name,
+        post.group.slug if post.group else '',
+        get_language(),
+    )
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f'post_card:{post.pk}:{digest}'
+
+
+@register.simple_tag
+def post_card(post):
+    """Карточка поста для лент, отрисованная один раз и взятая из кэша."""
+    key = card_cache_key(post)
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string(CARD_TEMPLATE, {'post': post})
+        cache.set(key, html, settings.POST_CARD_CACHE_TIMEOUT)
+    return mark_safe(html)
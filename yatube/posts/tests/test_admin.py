@@ -0,0 +1,162 @@
+# posts/tests/test_admin.py
+from datetime import date, datetime
+from unittest import mock
+
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.admin import PostAdmin
+from posts.counters import find_mismatches
+from posts.models import Group, Post, User
+from posts.templatetags.post_admin import indexed_dates
+
+CHANGELIST_URL = 'admin:posts_post_changelist'
+AUTOCOMPLETE_URL = 'admin:posts_group_autocomplete'
+DATES = (
+    datetime(2020, 3, 5), datetime(2020, 3, 9), datetime(2022, 7, 1),
+)
+
+
+class PostAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.groups = [
+            Group.objects.create(
+                title=f'Группа {number:02}', slug=f'group-{number}'
+            )
+            for number in range(25)
+        ]
+        for moment, group in zip(DATES, cls.groups):
+            post = Post.objects.create(
+                text='Тестовый текст', author=cls.admin, group=group
+            )
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=timezone.make_aware(moment)
+            )
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.admin)
+
+    def test_changelist_skips_table_count(self):
+        """Список постов не считает COUNT(*) по всей таблице"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(CHANGELIST_URL))
+        self.assertEqual(response.context['cl'].result_count, len(DATES))
+        self.assertFalse([
+            query['sql'] for query in queries
+            if 'COUNT(*)' in query['sql'] and 'posts_post' in query['sql']
+        ])
+
+    def test_indexed_dates(self):
+        """Периоды с постами совпадают с QuerySet.dates"""
+        for kind in ('year', 'month', 'day'):
+            with self.subTest(kind=kind):
+                self.assertEqual(
+                    indexed_dates(Post.objects.all(), 'pub_date', kind),
+                    list(Post.objects.dates('pub_date', kind)),
+                )
+        self.assertEqual(
+            indexed_dates(Post.objects.all(), 'pub_date', 'year'),
+            [date(2020, 1, 1), date(2022, 1, 1)],
+        )
+        self.assertEqual(
+            indexed_dates(Post.objects.none(), 'pub_date', 'year'), []
+        )
+
+    def test_date_hierarchy_drill_down(self):
+        """Переход по году показывает месяцы с постами"""
+        response = self.client.get(
+            reverse(CHANGELIST_URL), {'pub_date__year': 2020}
+        )
+        self.assertEqual(response.context['cl'].result_count, 2)
+        self.assertContains(response, 'pub_date__month=3')
+        self.assertNotContains(response, 'pub_date__month=7')
+
+    @mock.patch.object(PostAdmin, 'list_max_show_all', 2)
+    def test_show_all_is_capped(self):
+        """Полный список не длиннее list_max_show_all при любой оценке"""
+        response = self.client.get(reverse(CHANGELIST_URL), {'all': ''})
+        self.assertEqual(len(response.context['cl'].result_list), 2)
+
+    def test_changelist_group_editor(self):
+        """Редактор группы в строке не выводит и не запрашивает все группы"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(CHANGELIST_URL))
+        self.assertFalse([
+            query['sql'] for query in queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "posts_group"' in query['sql']
+        ])
+        for post in Post.objects.select_related('group'):
+            self.assertContains(
+                response,
+                f'<option value="{post.group.pk}" selected>'
+                f'{post.group.title}</option>',
+                html=True,
+            )
+        self.assertNotContains(response, self.groups[-1].title)
+
+    def test_group_autocomplete(self):
+        """Группы для редактора приходят поиском и по страницам"""
+        response = self.client.get(reverse(AUTOCOMPLETE_URL))
+        data = response.json()
+        self.assertEqual(len(data['results']), 20)
+        self.assertTrue(data['pagination']['more'])
+        self.assertEqual(data['results'][0]['text'], 'Группа 00')
+        response = self.client.get(
+            reverse(AUTOCOMPLETE_URL), {'term': 'group-24'}
+        )
+        self.assertEqual(
+            response.json()['results'],
+            [{'id': str(self.groups[-1].pk), 'text': 'Группа 24'}],
+        )
+
+    def test_move_to_group_action(self):
+        """Действие переносит выбранные посты в группу из панели действий"""
+        posts = list(Post.objects.order_by('pk')[:2])
+        target = self.groups[-1]
+        with self.assertLogs('posts.bulk'):
+            response = self.client.post(reverse(CHANGELIST_URL), {
+                'action': 'move_to_group',
+                'group': target.pk,
+                '_selected_action': [post.pk for post in posts],
+            }, follow=True)
+        self.assertContains(response, 'Перенесено постов: 2')
+        self.assertEqual(
+            set(Post.objects.filter(group=target)), set(posts)
+        )
+        self.assertEqual(find_mismatches(), [])
+
+    def test_move_to_group_requires_group(self):
+        """Без выбранной группы действие ничего не меняет"""
+        post = Post.objects.first()
+        response = self.client.post(reverse(CHANGELIST_URL), {
+            'action': 'move_to_group',
+            '_selected_action': [post.pk],
+        }, follow=True)
+        self.assertContains(response, 'Выберите группу для переноса')
+        self.assertEqual(Post.objects.get(pk=post.pk).group, post.group)
+
+    def test_clear_group_action_on_filtered_posts(self):
+        """Действие над всеми найденными постами учитывает фильтр списка"""
+        url = reverse(CHANGELIST_URL) + '?pub_date__year=2020'
+        with self.assertLogs('posts.bulk'):
+            self.client.post(url, {
+                'action': 'clear_group',
+                'select_across': '1',
+                '_selected_action': [Post.objects.first().pk],
+            })
+        self.assertEqual(
+            list(Post.objects.filter(group=None).dates('pub_date', 'year')),
+            [date(2020, 1, 1)],
+        )
+        self.assertEqual(Post.objects.filter(group=None).count(), 2)
+        self.assertEqual(find_mismatches(), [])
@@ -0,0 +1,95 @@
+# posts/tests/test_api.py
+from http import HTTPStatus
+
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from mixer.backend.django import mixer
+from posts.models import Group, Post, User
+from posts.paginators import encode_cursor
+
+USER_NAME = 'HasNoName'
+GROUP_SLUG = 'test'
+
+
+class FeedApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USER_NAME)
+        cls.group = Group.objects.create(
+            title='Test Group', slug=GROUP_SLUG, description='Test Group'
+        )
+        mixer.cycle(15).blend(
+            Post,
+            text=mixer.sequence('Тестовый текст {0}'),
+            author=cls.user,
+            group=cls.group,
+        )
+        Post.objects.create(text='Без группы', author=cls.user)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def get_json(self, url, **params):
+        response = self.guest_client.get(url, params)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return response.json()
+
+    def test_feeds_walk_by_cursor(self):
+        """Ленты API отдают все посты по курсору в порядке HTML-лент"""
+        feeds = {
+            reverse('posts:api_index'): Post.objects.all(),
+            reverse('posts:api_group_list', args=[GROUP_SLUG]):
+                self.group.group.all(),
+            reverse('posts:api_profile', args=[USER_NAME]):
+                self.user.posts.all(),
+        }
+        for url, posts in feeds.items():
+            with self.subTest(url=url):
+                data = self.get_json(url)
+                self.assertIsNone(data['previous'])
+                ids = [row['id'] for row in data['results']]
+                data = self.get_json(url, after=data['next'])
+                self.assertIsNone(data['next'])
+                ids += [row['id'] for row in data['results']]
+                self.assertEqual(ids, [post.pk for post in posts])
+
+    def test_cursor_with_huge_id_is_ignored(self):
+        """Курсор с id вне диапазона INTEGER даёт первую страницу"""
+        token = encode_cursor(Post.objects.first().pub_date, 10 ** 24)
+        first = self.get_json(reverse('posts:api_index'))
+        for param in ('after', 'before'):
+            with self.subTest(param=param):
+                data = self.get_json(
+                    reverse('posts:api_index'), **{param: token}
+                )
+                self.assertEqual(data['results'], first['results'])
+
+    def test_fields_limit_selected_columns(self):
+        """Параметр fields= ограничивает поля ответа и колонки запроса"""
+        url = reverse('posts:api_index')
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get_json(url, fields='id,author')
+        self.assertEqual(set(data['results'][0]), {'id', 'author'})
+        self.assertEqual(data['results'][0]['author'], USER_NAME)
+        feed_sql = queries[-1]['sql']
+        self.assertNotIn('"text"', feed_sql)
+        self.assertNotIn('posts_group', feed_sql)
+
+    def test_unknown_field_is_rejected(self):
+        """Неизвестное поле в fields= даёт ошибку 400"""
+        response = self.guest_client.get(
+            reverse('posts:api_index'), {'fields': 'id,password'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertIn('password', response.json()['error'])
+
+    def test_unknown_group_returns_404(self):
+        """Лента несуществующей группы отвечает 404"""
+        response = self.guest_client.get(
+            reverse('posts:api_group_list', args=['missing'])
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
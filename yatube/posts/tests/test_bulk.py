@@ -0,0 +1,72 @@
+# posts/tests/test_bulk.py
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from posts.bulk import move_posts
+from posts.counters import find_mismatches
+from posts.models import Group, Post, User
+from posts.page_cache import GLOBAL_SCOPE, get_generations
+
+
+class MovePostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group_1 = Group.objects.create(
+            title='Test Group 1', slug='test1', description='Test Group 1'
+        )
+        cls.group_2 = Group.objects.create(
+            title='Test Group 2', slug='test2', description='Test Group 2'
+        )
+        for number in range(5):
+            Post.objects.create(
+                text=f'Пост {number}', author=cls.user,
+                group=cls.group_1 if number % 2 else None,
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_move_keeps_counters(self):
+        """Перенос пачками меняет группу и счётчики всех затронутых групп"""
+        with self.assertLogs('posts.bulk') as logs:
+            moved = move_posts(Post.objects.all(), self.group_2, 2)
+        self.assertEqual(moved, 5)
+        self.assertEqual(len(logs.records), 3)
+        self.assertIn('проверено 5, перенесено 5', logs.output[-1])
+        self.assertEqual(Post.objects.filter(group=self.group_2).count(), 5)
+        self.assertEqual(find_mismatches(), [])
+        with self.assertLogs('posts.bulk'):
+            moved = move_posts(Post.objects.all(), None)
+        self.assertEqual(moved, 5)
+        self.assertFalse(Post.objects.filter(group__isnull=False).exists())
+        self.assertEqual(find_mismatches(), [])
+
+    def test_move_updates_versions_and_feeds(self):
+        """Перенесённые посты получают новую версию, ленты — поколение"""
+        versions = dict(Post.objects.values_list('pk', 'version'))
+        ungrouped = set(
+            Post.objects.filter(group=None).values_list('pk', flat=True)
+        )
+        generation, = get_generations((GLOBAL_SCOPE,))
+        with self.assertLogs('posts.bulk'):
+            move_posts(Post.objects.filter(group=None), self.group_1)
+        for pk, version in Post.objects.values_list('pk', 'version'):
+            self.assertEqual(version, versions[pk] + (pk in ungrouped))
+        self.assertFalse(Post.objects.filter(group=None).exists())
+        self.assertNotEqual(get_generations((GLOBAL_SCOPE,)), [generation])
+
+    def test_posts_already_in_group_are_skipped(self):
+        """Посты, уже стоящие в группе, не обновляются"""
+        posts = Post.objects.filter(group=self.group_1)
+        with self.assertLogs('posts.bulk'):
+            with CaptureQueriesContext(connection) as queries:
+                moved = move_posts(posts, self.group_1)
+        self.assertEqual(moved, 0)
+        self.assertFalse([
+            query['sql'] for query in queries
+            if query['sql'].startswith('UPDATE')
+        ])
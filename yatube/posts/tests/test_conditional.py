@@ -0,0 +1,112 @@
+# posts/tests/test_conditional.py
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.conditional import index_state
+from posts.models import Group, Post, User
+
+USER_NAME = 'HasNoName'
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USER_NAME)
+        cls.group = Group.objects.create(
+            title='Test Group', slug='test', description='Test Group'
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст', author=cls.user, group=cls.group
+        )
+        cls.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[cls.group.slug]),
+            reverse('posts:profile', args=[USER_NAME]),
+            reverse('posts:post_detail', args=[cls.post.pk]),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def etags(self):
+        return [self.guest_client.get(url)['ETag'] for url in self.urls]
+
+    def test_unchanged_page_returns_304(self):
+        """Повторный запрос с If-None-Match получает 304 без тела"""
+        for url, etag in zip(self.urls, self.etags()):
+            with self.subTest(url=url):
+                self.assertTrue(
+                    self.guest_client.get(url).has_header('Last-Modified')
+                )
+                response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b'')
+
+    def test_edit_changes_etag(self):
+        """Правка поста меняет ETag всех страниц с ним"""
+        before = self.etags()
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Новый текст'
+        post.save()
+        for url, old, new in zip(self.urls, before, self.etags()):
+            with self.subTest(url=url):
+                self.assertNotEqual(old, new)
+
+    def test_delete_changes_etag(self):
+        """Удаление поста меняет ETag ленты через счётчики"""
+        extra = Post.objects.create(
+            text='Лишний пост', author=self.user, group=self.group
+        )
+        before = self.etags()[:3]
+        extra.delete()
+        for url, old, new in zip(self.urls, before, self.etags()):
+            with self.subTest(url=url):
+                self.assertNotEqual(old, new)
+
+    @override_settings(SHARED_CACHE=True)
+    def test_index_etag_without_counters_sum(self):
+        """ETag ленты — один запрос и меняется при удалении старого поста"""
+        old = Post.objects.create(text='Старый пост', author=self.user)
+        Post.objects.filter(pk=old.pk).update(updated_at=self.post.pub_date)
+        url = self.urls[0]
+        with self.assertNumQueries(1):
+            index_state(None)
+        before = self.guest_client.get(url)['ETag']
+        old.delete()
+        self.assertNotEqual(before, self.guest_client.get(url)['ETag'])
+
+    def test_index_etag_without_shared_cache(self):
+        """Без общего кэша ETag ленты не зависит от поколений процесса"""
+        old = Post.objects.create(text='Старый пост', author=self.user)
+        Post.objects.filter(pk=old.pk).update(updated_at=self.post.pub_date)
+        url = self.urls[0]
+        # Как в другом воркере: сдвиг поколения при удалении не виден
+        with mock.patch(
+            'posts.conditional.get_generations', return_value=[0]
+        ):
+            before = self.guest_client.get(url)['ETag']
+            old.delete()
+            self.assertNotEqual(before, self.guest_client.get(url)['ETag'])
+
+    def test_etag_depends_on_user(self):
+        """Авторизованный и анонимный читатели получают разные ETag"""
+        client = Client()
+        client.force_login(self.user)
+        url = self.urls[0]
+        self.assertNotEqual(
+            client.get(url)['ETag'], self.guest_client.get(url)['ETag']
+        )
+
+    @override_settings(FEED_PAGE_CACHE=True)
+    def test_cached_page_returns_304(self):
+        """Страница из кэша анонимных лент тоже отвечает 304"""
+        url = self.urls[0]
+        etag = self.guest_client.get(url)['ETag']
+        self.assertEqual(self.guest_client.get(url)['ETag'], etag)
+        response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,106 @@
+# posts/tests/test_counters.py
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.counters import find_mismatches
+from posts.models import AuthorStats, Group, GroupStats, Post, User
+
+USER_NAME = 'HasNoName'
+
+
+def author_count(user):
+    stats = AuthorStats.objects.filter(author=user).first()
+    return stats.posts_count if stats else 0
+
+
+def group_count(group):
+    stats = GroupStats.objects.filter(group=group).first()
+    return stats.posts_count if stats else 0
+
+
+class PostCountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USER_NAME)
+        cls.group_1 = Group.objects.create(
+            title='Test Group 1', slug='test1', description='Test Group 1'
+        )
+        cls.group_2 = Group.objects.create(
+            title='Test Group 2', slug='test2', description='Test Group 2'
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_create_and_delete_update_counters(self):
+        """Создание и удаление поста меняют счётчики автора и группы"""
+        post = Post.objects.create(
+            text='Тестовый текст', author=self.user, group=self.group_1
+        )
+        Post.objects.create(text='Без группы', author=self.user)
+        self.assertEqual(author_count(self.user), 2)
+        self.assertEqual(group_count(self.group_1), 1)
+        post.delete()
+        self.assertEqual(author_count(self.user), 1)
+        self.assertEqual(group_count(self.group_1), 0)
+        self.assertEqual(find_mismatches(), [])
+
+    def test_post_edit_moves_post_between_groups(self):
+        """Смена группы в post_edit переносит пост между счётчиками"""
+        post = Post.objects.create(
+            text='Тестовый текст', author=self.user, group=self.group_1
+        )
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=[post.pk]),
+            {'text': 'Новый текст', 'group': self.group_2.pk},
+        )
+        self.assertEqual(group_count(self.group_1), 0)
+        self.assertEqual(group_count(self.group_2), 1)
+        self.assertEqual(author_count(self.user), 1)
+
+    def test_deferred_post_keeps_counters(self):
+        """Пост, загруженный без группы, корректно меняет счётчики"""
+        post = Post.objects.create(
+            text='Тестовый текст', author=self.user, group=self.group_1
+        )
+        post = Post.objects.only('text').get(pk=post.pk)
+        post.group = self.group_2
+        post.save()
+        self.assertEqual(find_mismatches(), [])
+
+    def test_admin_list_editable_changes_group(self):
+        """Смена группы в списке постов админки обновляет счётчики"""
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        post = Post.objects.create(
+            text='Тестовый текст', author=self.user, group=self.group_1
+        )
+        client = Client()
+        client.force_login(admin)
+        client.post(reverse('admin:posts_post_changelist'), {
+            'form-TOTAL_FORMS': 1,
+            'form-INITIAL_FORMS': 1,
+            'form-0-id': post.pk,
+            'form-0-group': self.group_2.pk,
+            '_save': 'Сохранить',
+        })
+        self.assertEqual(group_count(self.group_2), 1)
+        self.assertEqual(find_mismatches(), [])
+
+    def test_rebuild_and_check_commands(self):
+        """Команда пересчитывает счётчики и находит расхождения"""
+        Post.objects.create(
+            text='Тестовый текст', author=self.user, group=self.group_1
+        )
+        GroupStats.objects.filter(group=self.group_1).update(posts_count=5)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_post_counters', '--check', stdout=StringIO())
+        call_command('rebuild_post_counters', stdout=StringIO())
+        self.assertEqual(group_count(self.group_1), 1)
+        call_command('rebuild_post_counters', '--check', stdout=StringIO())
@@ -0,0 +1,82 @@
+# posts/tests/test_export.py
+import csv
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from posts.models import Group, Post, User
+
+
+def export(*args):
+    out = StringIO()
+    call_command('export_posts', *args, stdout=out)
+    return out.getvalue()
+
+
+class ExportPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.other = User.objects.create_user(username='Other')
+        cls.group = Group.objects.create(
+            title='Test Group', slug='test', description='Test Group'
+        )
+        cls.old_post = Post.objects.create(
+            text='Старый пост', author=cls.user, group=cls.group
+        )
+        Post.objects.filter(pk=cls.old_post.pk).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        cls.post = Post.objects.create(text='Пост, "с кавычками"',
+                                       author=cls.other)
+
+    def test_ndjson_export(self):
+        """Каждый пост выгружается отдельной строкой JSON"""
+        rows = [
+            json.loads(line)
+            for line in export('--chunk-size', '1').splitlines()
+        ]
+        self.assertEqual([row['id'] for row in rows], [
+            self.old_post.pk, self.post.pk
+        ])
+        self.assertEqual(rows[0]['author'], 'HasNoName')
+        self.assertEqual(rows[0]['group'], 'test')
+        self.assertIsNone(rows[1]['group'])
+
+    def test_csv_export(self):
+        """CSV содержит заголовок и экранирует текст"""
+        rows = list(csv.reader(StringIO(export('--format', 'csv'))))
+        self.assertEqual(
+            rows[0], ['id', 'text', 'pub_date', 'author', 'group']
+        )
+        self.assertEqual(rows[2][1], 'Пост, "с кавычками"')
+
+    def test_filters(self):
+        """Фильтры --since, --group и --author сужают выгрузку"""
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        for args, expected in (
+            (('--since', since), self.post),
+            (('--group', 'test'), self.old_post),
+            (('--author', 'Other'), self.post),
+        ):
+            with self.subTest(args=args):
+                rows = export(*args).splitlines()
+                self.assertEqual(len(rows), 1)
+                self.assertEqual(json.loads(rows[0])['id'], expected.pk)
+
+    def test_bad_since_date(self):
+        """Неверная дата в --since — ошибка команды"""
+        with self.assertRaises(CommandError):
+            export('--since', 'вчера')
+
+    def test_bad_chunk_size(self):
+        """Размер пачки меньше единицы — ошибка команды"""
+        for size in ('0', '-5'):
+            with self.subTest(size=size):
+                with self.assertRaises(CommandError):
+                    export('--chunk-size', size)
@@ -0,0 +1,171 @@
+# posts/tests/test_group_cache.py
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.counters import stored_count
+from posts.group_cache import groups, write_stamp
+from posts.models import Group, Post, User
+
+
+@override_settings(GROUP_CACHE=True, SHARED_CACHE=True)
+class GroupCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug',
+            description='Тестовое описание',
+        )
+        for number in range(3):
+            Post.objects.create(
+                text=f'Пост {number}', author=cls.user, group=cls.group
+            )
+
+    def setUp(self):
+        cache.clear()
+        groups.clear()
+
+    def test_group_is_read_once(self):
+        """Группа читается из базы один раз, дальше — из памяти"""
+        with self.assertNumQueries(1):
+            first = groups.get('test-slug')
+        with self.assertNumQueries(0):
+            second = groups.get('test-slug')
+        self.assertEqual(first, self.group)
+        self.assertEqual(second.title, 'Тестовая группа')
+        self.assertIsNot(first, second)
+        with self.assertNumQueries(0):
+            self.assertEqual(stored_count(second), 3)
+
+    def test_post_changes_refresh_count(self):
+        """Новый пост группы перечитывает её вместе со счётчиком"""
+        groups.get('test-slug')
+        Post.objects.create(text='Ещё пост', author=self.user,
+                            group=self.group)
+        with self.assertNumQueries(1):
+            self.assertEqual(stored_count(groups.get('test-slug')), 4)
+        empty = Group.objects.create(
+            title='Пустая группа', slug='empty', description='Описание'
+        )
+        self.assertEqual(stored_count(groups.get(empty.slug)), 0)
+
+    def test_group_page_queries(self):
+        """Прогретый кэш: 404 без запросов, страница группы — два"""
+        self.client.get('/group/test-slug/')
+        self.client.get('/group/unknown/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/group/unknown/')
+        self.assertEqual(response.status_code, 404)
+        # MAX(updated_at) для валидаторов и страница постов
+        with self.assertNumQueries(2):
+            response = self.client.get('/group/test-slug/')
+        self.assertEqual(len(response.context['page_obj']), 3)
+        url = reverse('posts:api_group_list', args=['test-slug'])
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            self.assertEqual(len(self.client.get(url).json()['results']), 3)
+
+    def test_missing_slug_is_cached(self):
+        """Несуществующий слаг не запрашивается повторно"""
+        with self.assertNumQueries(1):
+            self.assertIsNone(groups.get('unknown'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(groups.get('unknown'))
+        response = self.client.get('/group/unknown/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_group_changes_invalidate_cache(self):
+        """Создание, правка и удаление группы видны сразу"""
+        self.assertIsNone(groups.get('new-slug'))
+        group = Group.objects.create(
+            title='Новая группа', slug='new-slug', description='Описание'
+        )
+        self.assertEqual(groups.get('new-slug'), group)
+        group.title = 'Переименованная группа'
+        group.save()
+        self.assertEqual(
+            groups.get('new-slug').title, 'Переименованная группа'
+        )
+        group.delete()
+        self.assertIsNone(groups.get('new-slug'))
+
+    def test_other_process_invalidation(self):
+        """Сдвиг общего поколения сбрасывает группы в памяти процесса"""
+        groups.get('test-slug')
+        Group.objects.filter(pk=self.group.pk).update(title='Без сигнала')
+        self.assertEqual(groups.get('test-slug').title, 'Тестовая группа')
+        cache.clear()
+        self.assertEqual(groups.get('test-slug').title, 'Без сигнала')
+
+    @override_settings(GROUP_CACHE_SIZE=1, GROUP_CACHE_MISSING_SIZE=1)
+    def test_least_recently_used_are_evicted(self):
+        """Перебор слагов не вытесняет найденные группы"""
+        groups.get('test-slug')
+        groups.get('unknown-1')
+        groups.get('unknown-2')
+        with self.assertNumQueries(0):
+            groups.get('test-slug')
+            groups.get('unknown-2')
+        with self.assertNumQueries(1):
+            groups.get('unknown-1')
+
+    @override_settings(GROUP_CACHE=False)
+    def test_disabled_cache(self):
+        """Выключенный кэш читает группу из базы на каждом вызове"""
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                group = groups.get('test-slug')
+            self.assertEqual(stored_count(group), 3)
+
+
+@override_settings(GROUP_CACHE=True, SHARED_CACHE=False)
+class GroupCacheStampTests(TestCase):
+    """Кэш групп без общего кэша: изменения отмечает файл."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.create(text='Пост', author=cls.user, group=cls.group)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'groups.stamp')
+        settings = override_settings(GROUP_CACHE_STAMP=self.path)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        cache.clear()
+        groups.clear()
+
+    def test_unknown_slug_without_queries(self):
+        """Перебор слагов не доходит до базы и без общего кэша"""
+        self.client.get('/group/unknown/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/group/unknown/')
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_stamp_invalidates_other_processes(self):
+        """Новая отметка в файле сбрасывает группы этого процесса"""
+        groups.get('test-slug')
+        Group.objects.filter(pk=self.group.pk).update(title='Без сигнала')
+        self.assertEqual(groups.get('test-slug').title, 'Тестовая группа')
+        # Так группы сбрасывает другой процесс: общий у них только файл
+        write_stamp(self.path)
+        self.assertEqual(groups.get('test-slug').title, 'Без сигнала')
+
+    def test_count_is_read_from_database(self):
+        """Число постов не берётся из памяти процесса"""
+        groups.get('test-slug')
+        with self.assertNumQueries(1):
+            self.assertEqual(stored_count(groups.get('test-slug')), 1)
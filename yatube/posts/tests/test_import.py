@@ -0,0 +1,81 @@
+# posts/tests/test_import.py
+import json
+import os
+import tempfile
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.counters import find_mismatches
+from posts.models import Group, Post, User
+from posts.search import search_posts
+
+
+class ImportPostsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Test Group', slug='test', description='Test Group'
+        )
+
+    def run_import(self, content, *args):
+        handle, path = tempfile.mkstemp()
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            file.write(content)
+        self.addCleanup(os.remove, path)
+        out, err = StringIO(), StringIO()
+        call_command('import_posts', path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_ndjson_import(self):
+        """Посты загружаются пачками с исходной датой и счётчиками"""
+        rows = [
+            {'text': f'Кошка номер {i}', 'author': 'HasNoName',
+             'group': 'test', 'pub_date': f'2020-01-0{i + 1}T10:00:00Z'}
+            for i in range(5)
+        ]
+        content = '\n'.join(json.dumps(row) for row in rows)
+        out, err = self.run_import(content, '--batch-size', '2')
+        self.assertIn('Загружено постов: 5', out)
+        self.assertEqual(err, '')
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertEqual(
+            Post.objects.last().pub_date,
+            datetime(2020, 1, 1, 10, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(find_mismatches(), [])
+        self.assertEqual(
+            search_posts(Post.objects.all(), 'кошка').count(), 5
+        )
+
+    def test_invalid_rows_are_skipped(self):
+        """Записи с пустым текстом, чужим автором или группой пропускаются"""
+        content = '\n'.join([
+            json.dumps({'text': '   ', 'author': 'HasNoName'}),
+            json.dumps({'text': 'Текст', 'author': 'nobody'}),
+            json.dumps({'text': 'Текст', 'author': 'HasNoName',
+                        'group': 'missing'}),
+            '{битый json',
+            json.dumps({'text': 'Текст', 'author': 'HasNoName'}),
+        ])
+        out, err = self.run_import(content)
+        self.assertIn('Загружено постов: 1, пропущено: 4', out)
+        self.assertEqual(len(err.splitlines()), 4)
+
+    def test_csv_roundtrip_with_export(self):
+        """Выгрузка export_posts в CSV загружается обратно"""
+        Post.objects.create(
+            text='Текст, "с кавычками"', author=self.user, group=self.group
+        )
+        dump = StringIO()
+        call_command('export_posts', '--format', 'csv', stdout=dump)
+        Post.objects.all().delete()
+        self.run_import(dump.getvalue(), '--format', 'csv')
+        post = Post.objects.get()
+        self.assertEqual(post.text, 'Текст, "с кавычками"')
+        self.assertEqual(post.group, self.group)
@@ -0,0 +1,83 @@
+# posts/tests/test_page_cache.py
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+USER_NAME = 'HasNoName'
+INDEX_URL = 'posts:index'
+
+
+@override_settings(FEED_PAGE_CACHE=True)
+class AnonymousPageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USER_NAME)
+        cls.group_1 = Group.objects.create(
+            title='Test Group 1', slug='test1', description='Test Group 1'
+        )
+        cls.group_2 = Group.objects.create(
+            title='Test Group 2', slug='test2', description='Test Group 2'
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст', author=cls.user, group=cls.group_1
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_repeated_anonymous_hit_skips_database(self):
+        """Повторный анонимный запрос ленты не обращается к базе"""
+        urls = (
+            reverse(INDEX_URL),
+            reverse('posts:group_list', args=['test1']),
+            reverse('posts:profile', args=[USER_NAME]),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                first = self.guest_client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.guest_client.get(url)
+                self.assertEqual(first.content, second.content)
+
+    def test_new_post_refreshes_only_affected_feeds(self):
+        """Новый пост обновляет свои ленты, другие остаются в кэше"""
+        group_2_url = reverse('posts:group_list', args=['test2'])
+        self.guest_client.get(reverse(INDEX_URL))
+        self.guest_client.get(group_2_url)
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            {'text': 'Свежий пост', 'group': self.group_1.pk},
+        )
+        response = self.guest_client.get(reverse(INDEX_URL))
+        self.assertContains(response, 'Свежий пост')
+        with self.assertNumQueries(0):
+            self.guest_client.get(group_2_url)
+
+    def test_post_edit_refreshes_old_and_new_group(self):
+        """Перенос поста между группами обновляет обе ленты групп"""
+        group_1_url = reverse('posts:group_list', args=['test1'])
+        group_2_url = reverse('posts:group_list', args=['test2'])
+        self.guest_client.get(group_1_url)
+        self.guest_client.get(group_2_url)
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=[self.post.pk]),
+            {'text': 'Перенесённый пост', 'group': self.group_2.pk},
+        )
+        self.assertNotContains(
+            self.guest_client.get(group_1_url), 'Перенесённый пост'
+        )
+        self.assertContains(
+            self.guest_client.get(group_2_url), 'Перенесённый пост'
+        )
+
+    def test_logged_in_users_are_not_cached(self):
+        """Страницы авторизованных пользователей не кэшируются"""
+        self.authorized_client.get(reverse(INDEX_URL))
+        response = self.authorized_client.get(reverse(INDEX_URL))
+        self.assertIsNotNone(response.context)
@@ -0,0 +1,244 @@
+# posts/tests/test_paginators.py
+from http import HTTPStatus
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.paginator import Page
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from mixer.backend.django import mixer
+from posts.counters import total_count
+from posts.models import Group, Post, User
+from posts.paginators import CountedPaginator, decode_cursor, encode_cursor
+from posts.search import search_posts
+
+USER_NAME = 'HasNoName'
+INDEX_URL = 'posts:index'
+MAIN_GROUP_SLUG = 'test0'
+MAIN_GROUP_URL = f'/group/{MAIN_GROUP_SLUG}/'
+USER_PROFILE_URL = f'/profile/{USER_NAME}/'
+
+
+@override_settings(FEED_PAGINATION='cursor')
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USER_NAME)
+        mixer.cycle(2).blend(
+            Group,
+            title=mixer.sequence('Test Group {0}'),
+            slug=mixer.sequence('test{0}'),
+            description=mixer.sequence('Test Group {0}')
+        )
+        mixer.cycle(16).blend(
+            Post,
+            text=mixer.sequence('Тестовый текст {0}'),
+            author=cls.user,
+            group=(Group.objects.get(slug=MAIN_GROUP_SLUG))
+        )
+        mixer.cycle(11).blend(
+            Post,
+            text=mixer.sequence('Тестовый текст {0}'),
+            author=cls.user,
+            group=(Group.objects.get(slug='test1'))
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_cursor_roundtrip(self):
+        """Токен курсора раскодируется в исходный ключ"""
+        post = Post.objects.first()
+        token = encode_cursor(post.pub_date, post.pk)
+        self.assertEqual(decode_cursor(token), (post.pub_date, post.pk))
+        self.assertIsNone(decode_cursor('не-токен'))
+
+    def test_index_walks_all_posts_by_cursor(self):
+        """Переход по курсорам проходит ленту без пропусков и повторов"""
+        expected = list(Post.objects.all())
+        seen = []
+        url = reverse(INDEX_URL)
+        while True:
+            response = self.guest_client.get(url)
+            page_obj = response.context['page_obj']
+            self.assertIsInstance(page_obj, Page)
+            seen.extend(page_obj)
+            if not page_obj.has_next():
+                break
+            url = reverse(INDEX_URL) + f'?after={page_obj.next_cursor}'
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(page_obj), 7)
+
+    def test_before_cursor_returns_previous_page(self):
+        """Курсор before возвращает предыдущую страницу"""
+        first = self.guest_client.get(MAIN_GROUP_URL).context['page_obj']
+        second = self.guest_client.get(
+            MAIN_GROUP_URL + f'?after={first.next_cursor}'
+        ).context['page_obj']
+        self.assertEqual(len(second), 6)
+        self.assertTrue(second.has_previous())
+        back = self.guest_client.get(
+            MAIN_GROUP_URL + f'?before={second.previous_cursor}'
+        ).context['page_obj']
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous())
+
+    def test_legacy_page_link_redirects_to_cursor(self):
+        """Старая ссылка ?page=N перенаправляет на курсор той же страницы"""
+        response = self.guest_client.get(USER_PROFILE_URL + '?page=3')
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        self.assertIn('?after=', response.url)
+        response = self.guest_client.get(response.url)
+        self.assertEqual(len(response.context['page_obj']), 7)
+
+    def test_broken_cursor_shows_first_page(self):
+        """Битый курсор показывает первую страницу"""
+        response = self.guest_client.get(reverse(INDEX_URL) + '?after=xyz')
+        page_obj = response.context['page_obj']
+        self.assertEqual(list(page_obj), list(Post.objects.all()[:10]))
+
+    def test_cursor_with_huge_id_shows_first_page(self):
+        """Курсор с id вне диапазона INTEGER показывает первую страницу"""
+        first = list(Post.objects.all()[:10])
+        for pk in (0, -1, 2 ** 63, 10 ** 24):
+            token = encode_cursor(Post.objects.first().pub_date, pk)
+            self.assertIsNone(decode_cursor(token))
+            for param in ('after', 'before'):
+                with self.subTest(pk=pk, param=param):
+                    response = self.guest_client.get(
+                        MAIN_GROUP_URL, {param: token}
+                    )
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
+                    self.assertEqual(
+                        list(response.context['page_obj']),
+                        list(Post.objects.filter(
+                            group__slug=MAIN_GROUP_SLUG
+                        )[:10]),
+                    )
+        response = self.guest_client.get(reverse(INDEX_URL), {
+            'after': encode_cursor(first[0].pub_date, 2 ** 70),
+        })
+        self.assertEqual(list(response.context['page_obj']), first)
+
+    def test_legacy_link_with_huge_page_number(self):
+        """Огромный номер старой ссылки ?page=N не ломает перенаправление"""
+        response = self.guest_client.get(
+            USER_PROFILE_URL, {'page': '9' * 25}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+
+class CountedPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USER_NAME)
+        cls.group = Group.objects.create(
+            title='Test Group', slug=MAIN_GROUP_SLUG, description='Test'
+        )
+        mixer.cycle(25).blend(
+            Post,
+            text=mixer.sequence('Тестовый текст {0}'),
+            author=cls.user,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_feeds_take_count_from_counters(self):
+        """Ленты берут число постов из счётчиков, а не из COUNT(*)"""
+        for url in (reverse(INDEX_URL), MAIN_GROUP_URL, USER_PROFILE_URL):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.guest_client.get(url)
+                self.assertEqual(
+                    response.context['page_obj'].paginator.num_pages, 3
+                )
+                self.assertFalse(any(
+                    'COUNT(' in query['sql'] for query in queries
+                ))
+
+    @override_settings(FEED_COUNT_LIMIT=15)
+    def test_many_pages_mode_above_limit(self):
+        """Выше порога пагинатор не считает страницы, но листает дальше"""
+        post_list = Post.objects.for_feed()
+        paginator = CountedPaginator(post_list, 10)
+        page = paginator.get_page(1)
+        self.assertTrue(paginator.many_pages)
+        self.assertTrue(page.has_next())
+        page = paginator.get_page(3)
+        self.assertEqual(list(page), list(post_list[20:]))
+        self.assertFalse(page.has_next())
+        self.assertEqual(page.end_index(), 25)
+        self.assertEqual(paginator.get_page(9).number, 2)
+
+    @override_settings(FEED_COUNT_LIMIT=15)
+    def test_huge_page_number_in_many_pages_mode(self):
+        """Номер страницы за пределами INTEGER даёт последнюю известную"""
+        paginator = CountedPaginator(Post.objects.for_feed(), 10)
+        self.assertEqual(paginator.get_page(10 ** 20).number, 2)
+        response = self.guest_client.get(
+            reverse('posts:search'), {'q': 'Тестовый', 'page': 10 ** 20}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.context['page_obj'].paginator.many_pages)
+
+    def test_count_skips_ordering(self):
+        """Подсчёт результатов поиска не ранжирует совпадения"""
+        paginator = CountedPaginator(
+            search_posts(Post.objects.for_feed(), 'Тестовый'), 10
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(paginator.count, 25)
+        self.assertNotIn('ORDER BY', queries[0]['sql'])
+
+    @mock.patch('posts.counters.get_generations', return_value=[0])
+    def test_total_without_shared_cache(self, get_generations):
+        """Без общего кэша число постов не берётся из кэша процесса"""
+        self.assertEqual(total_count(), 25)
+        Post.objects.create(text='Ещё пост', author=self.user)
+        self.assertEqual(total_count(), 26)
+
+    def test_exact_count_below_limit(self):
+        """Ниже порога число постов считается точно"""
+        paginator = CountedPaginator(Post.objects.for_feed(), 10)
+        self.assertEqual(paginator.count, 25)
+        self.assertFalse(paginator.many_pages)
+
+    def test_elided_page_range(self):
+        """Ссылки на страницы ограничены краями и окном вокруг текущей"""
+        paginator = CountedPaginator(
+            Post.objects.for_feed(), 10, count=100000
+        )
+        links = paginator.get_page(5000).page_links
+        self.assertEqual(links, [
+            1, paginator.ELLIPSIS, 4998, 4999, 5000, 5001, 5002,
+            paginator.ELLIPSIS, 10000,
+        ])
+        self.assertEqual(
+            paginator.get_page(3).page_links,
+            [1, 2, 3, 4, 5, paginator.ELLIPSIS, 10000],
+        )
+        self.assertEqual(
+            paginator.get_elided_page_range(4),
+            [1, 2, 3, 4, 5, 6, paginator.ELLIPSIS, 10000],
+        )
+
+    @override_settings(FEED_COUNT_LIMIT=15)
+    def test_elided_range_in_many_pages_mode(self):
+        """В режиме «много страниц» конец ленты заменён пропуском"""
+        paginator = CountedPaginator(Post.objects.for_feed(), 10)
+        self.assertEqual(
+            paginator.get_page(1).page_links,
+            [1, 2, paginator.ELLIPSIS],
+        )
+        self.assertEqual(
+            paginator.get_page(3).page_links,
+            [1, 2, 3, paginator.ELLIPSIS],
+        )
@@ -0,0 +1,60 @@
+# posts/tests/test_post_cards.py
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+from posts.templatetags.post_cards import card_cache_key
+
+USER_NAME = 'HasNoName'
+INDEX_URL = 'posts:index'
+
+
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USER_NAME)
+        cls.group = Group.objects.create(
+            title='Test Group', slug='test', description='Test Group'
+        )
+        cls.post = Post.objects.create(
+            text='Тестовый текст', author=cls.user, group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def get_index(self):
+        return self.authorized_client.get(reverse(INDEX_URL)).content.decode()
+
+    def test_card_is_cached(self):
+        """Карточка поста после отрисовки лежит в кэше"""
+        self.get_index()
+        post = Post.objects.for_feed().get(pk=self.post.pk)
+        html = cache.get(card_cache_key(post))
+        self.assertIn('Тестовый текст', html)
+        cache.set(card_cache_key(post), '<p>из кэша</p>')
+        self.assertIn('из кэша', self.get_index())
+
+    def test_post_edit_invalidates_card(self):
+        """Правка поста в post_edit показывает новый текст"""
+        self.get_index()
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=[self.post.pk]),
+            {'text': 'Новый текст', 'group': ''},
+        )
+        html = self.get_index()
+        self.assertIn('Новый текст', html)
+        self.assertNotIn(reverse('posts:group_list', args=['test']), html)
+
+    def test_group_and_author_changes_invalidate_card(self):
+        """Смена слага группы и имени автора меняет ключ карточки"""
+        self.get_index()
+        Group.objects.filter(pk=self.group.pk).update(slug='renamed')
+        User.objects.filter(pk=self.user.pk).update(first_name='Иван')
+        html = self.get_index()
+        self.assertIn(reverse('posts:group_list', args=['renamed']), html)
+        self.assertIn('Иван', html)
@@ -0,0 +1,97 @@
+# posts/tests/test_query_budget.py
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from core.decorators import QueryBudgetExceeded, query_budget
+from mixer.backend.django import mixer
+from posts.models import Group, Post, User
+
+USER_NAME = 'HasNoName'
+
+
+@override_settings(QUERY_BUDGET_ENFORCE=False)
+class ViewQueryBudgetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USER_NAME)
+        cls.group = Group.objects.create(
+            title='Test Group',
+            slug='test',
+            description='Test Group',
+        )
+        mixer.cycle(25).blend(
+            Post,
+            text=mixer.sequence('Тестовый текст {0}'),
+            author=cls.user,
+            group=cls.group,
+        )
+        cls.post = Post.objects.first()
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def feed_urls(self):
+        return (
+            '/',
+            '/?page=2',
+            f'/group/{self.group.slug}/',
+            f'/profile/{USER_NAME}/',
+        )
+
+    def assertWithinBudget(self, url, data=None):
+        budget = resolve(url.split('?')[0]).func.query_budget
+        with CaptureQueriesContext(connection) as queries:
+            if data is None:
+                self.authorized_client.get(url)
+            else:
+                self.authorized_client.post(url, data)
+        self.assertLessEqual(
+            len(queries), budget, [q['sql'] for q in queries]
+        )
+
+    def test_views_stay_within_query_budget(self):
+        """View укладываются в свой лимит SQL-запросов"""
+        urls = self.feed_urls() + (
+            '/api/posts/',
+            f'/api/group/{self.group.slug}/',
+            f'/api/profile/{USER_NAME}/',
+            '/search/?q=Тестовый',
+            f'/posts/{self.post.pk}/',
+            '/create/',
+            f'/posts/{self.post.pk}/edit/',
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertWithinBudget(url)
+
+    def test_forms_stay_within_query_budget(self):
+        """Создание и редактирование поста укладываются в лимит запросов"""
+        form_data = {'text': 'Новый текст', 'group': self.group.pk}
+        for url in ('/create/', f'/posts/{self.post.pk}/edit/'):
+            with self.subTest(url=url):
+                self.assertWithinBudget(url, form_data)
+
+    @override_settings(FEED_PAGINATION='cursor')
+    def test_cursor_feeds_stay_within_query_budget(self):
+        """Ленты с курсорной пагинацией укладываются в лимит запросов"""
+        for url in self.feed_urls():
+            with self.subTest(url=url):
+                self.assertWithinBudget(url)
+
+
+class QueryBudgetDecoratorTests(TestCase):
+    @override_settings(QUERY_BUDGET_ENFORCE=True)
+    def test_budget_exceeded_raises(self):
+        """Превышение лимита запросов поднимает QueryBudgetExceeded"""
+        @query_budget(0)
+        def view(request):
+            User.objects.count()
+            return HttpResponse()
+
+        with self.assertRaises(QueryBudgetExceeded):
+            view(RequestFactory().get('/'))
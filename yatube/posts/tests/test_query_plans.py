@@ -0,0 +1,77 @@
+# posts/tests/test_query_plans.py
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.test import TestCase
+from django.utils import timezone
+
+from posts.models import Group, Post, User
+from posts.paginators import CursorPaginator
+
+# Признаки того, что SQLite сортирует выборку или читает всю таблицу
+BAD_PLAN_MARKERS = ('USE TEMP B-TREE', 'SCAN TABLE posts_post')
+
+
+def full_scan(plan):
+    """Полный просмотр posts_post без индекса."""
+    return any(
+        line.strip().endswith('SCAN posts_post')
+        for line in plan.splitlines()
+    )
+
+
+class FeedQueryPlanTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.group = Group.objects.create(
+            title='Test Group',
+            slug='test',
+            description='Test Group',
+        )
+        Post.objects.create(
+            text='Тестовый текст',
+            author=cls.user,
+            group=cls.group,
+        )
+
+    def feed_querysets(self):
+        """Те же запросы, что строят ленты в posts/views.py."""
+        return {
+            'index': Post.objects.for_feed(),
+            'group_posts': self.group.group.for_feed(),
+            'profile': self.user.posts.for_feed(),
+        }
+
+    def assertPlanUsesIndex(self, queryset):
+        plan = queryset.explain()
+        for marker in BAD_PLAN_MARKERS:
+            self.assertNotIn(marker, plan)
+        self.assertFalse(full_scan(plan), plan)
+        return plan
+
+    def test_numbered_feed_pages_use_indexes(self):
+        """Страница ленты по номеру читается по индексу без сортировки"""
+        for view, post_list in self.feed_querysets().items():
+            with self.subTest(view=view):
+                paginator = Paginator(post_list, settings.PAGINATOR_VALUE)
+                self.assertPlanUsesIndex(paginator.page(1).object_list)
+
+    def test_cursor_feed_pages_use_indexes(self):
+        """Страница ленты по курсору читается по индексу без сортировки"""
+        position = (timezone.now(), 1)
+        for view, post_list in self.feed_querysets().items():
+            paginator = CursorPaginator(post_list, settings.PAGINATOR_VALUE)
+            querysets = {
+                'first': paginator.keyset_queryset(),
+                'after': paginator.keyset_queryset(position),
+                'before': paginator.keyset_queryset(
+                    position, backwards=True
+                ),
+            }
+            for page, queryset in querysets.items():
+                with self.subTest(view=view, page=page):
+                    plan = self.assertPlanUsesIndex(queryset)
+                    if page != 'first':
+                        # Курсор должен стать границей поиска по индексу
+                        self.assertIn('pub_date', plan)
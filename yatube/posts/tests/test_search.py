@@ -0,0 +1,79 @@
+# posts/tests/test_search.py
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post, User
+from posts.search import fts_query
+
+SEARCH_URL = 'posts:search'
+
+
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='HasNoName')
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.cat_post = Post.objects.create(
+            text='Кошка спит на окне', author=cls.user
+        )
+        cls.cats_post = Post.objects.create(
+            text='Кошка и ещё раз кошка: кошка ловит мышь', author=cls.user
+        )
+        Post.objects.create(text='Собака лает во дворе', author=cls.user)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def search(self, query):
+        response = self.guest_client.get(reverse(SEARCH_URL), {'q': query})
+        return list(response.context['page_obj'])
+
+    def test_search_ranks_by_relevance(self):
+        """Поиск находит посты и ставит самые релевантные первыми"""
+        self.assertEqual(self.search('кошка'), [
+            self.cats_post, self.cat_post
+        ])
+        self.assertEqual(self.search('кошка окне'), [self.cat_post])
+        self.assertEqual(self.search(''), [])
+
+    def test_index_follows_edits_and_deletes(self):
+        """Индекс обновляется при изменении и удалении поста"""
+        post = Post.objects.get(pk=self.cat_post.pk)
+        post.text = 'Попугай сидит на окне'
+        post.save()
+        self.assertEqual(self.search('попугай'), [post])
+        self.assertNotIn(post, self.search('кошка'))
+        post.delete()
+        self.assertEqual(self.search('попугай'), [])
+
+    def test_query_syntax_is_escaped(self):
+        """Спецсимволы FTS5 во вводе не ломают поиск"""
+        self.assertEqual(fts_query('a "b'), '"a" """b"')
+        self.assertEqual(self.search('"кошка OR NOT'), [])
+
+    def test_reindex_command_restores_index(self):
+        """Команда reindex_posts восстанавливает индекс"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO posts_post_fts(posts_post_fts) "
+                "VALUES ('delete-all')"
+            )
+        self.assertEqual(self.search('собака'), [])
+        call_command('reindex_posts', stdout=StringIO())
+        self.assertEqual(len(self.search('собака')), 1)
+
+    def test_admin_search_uses_index(self):
+        """Поиск в админке находит посты по индексу"""
+        client = Client()
+        client.force_login(self.admin)
+        response = client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'собака'}
+        )
+        self.assertEqual(response.context['cl'].result_count, 1)
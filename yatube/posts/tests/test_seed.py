@@ -0,0 +1,81 @@
+# posts/tests/test_seed.py
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
+from random import Random
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from posts.counters import find_mismatches
+from posts.management.commands.seed import post_rows, seed_end
+from posts.models import Post
+from posts.paginators import CursorPaginator
+from posts.search import search_posts
+
+
+def seed(**options):
+    call_command('seed', stdout=StringIO(), **options)
+
+
+class SeedCommandTests(TestCase):
+    def test_seed_creates_consistent_data(self):
+        """Посты создаются со счётчиками, индексами и поиском"""
+        seed(users=20, groups=5, posts=2000, seed=1)
+        self.assertEqual(Post.objects.count(), 2000)
+        self.assertEqual(find_mismatches(), [])
+        self.assertTrue(search_posts(Post.objects.all(), 'кошка').exists())
+        with connection.cursor() as cursor:
+            indexes = connection.introspection.get_constraints(
+                cursor, Post._meta.db_table
+            )
+        self.assertIn('post_feed_idx', indexes)
+
+    def test_authors_follow_power_law(self):
+        """Самый активный автор пишет намного больше медианного"""
+        seed(users=50, groups=5, posts=5000, seed=2)
+        counts = sorted(
+            Counter(Post.objects.values_list('author', flat=True)).values(),
+            reverse=True,
+        )
+        self.assertGreater(counts[0], counts[len(counts) // 2] * 5)
+        self.assertTrue(Post.objects.filter(group=None).exists())
+
+    def test_same_seed_gives_same_rows(self):
+        """Одно зерно даёт те же строки; повтор зерна в базе — ошибка"""
+        def rows(seed):
+            batch, = post_rows(
+                Random(seed), 100, [1, 2, 3], [1, 2], seed_end(seed), 10
+            )
+            return batch
+
+        self.assertEqual(rows(3), rows(3))
+        self.assertNotEqual(rows(3), rows(4))
+        seed(users=5, groups=2, posts=100, seed=3)
+        dates = list(Post.objects.order_by('pk').values_list(
+            'pub_date', flat=True
+        ))
+        self.assertEqual(dates[-1], max(dates))
+        self.assertLessEqual(dates[-1], seed_end(3))
+        self.assertGreater(dates[0], seed_end(3) - timedelta(days=365))
+        with self.assertRaises(CommandError):
+            seed(users=5, groups=2, posts=100, seed=3)
+
+    def test_cursor_pages_do_not_repeat_posts(self):
+        """Даты в формате Django: курсорные страницы не повторяют посты"""
+        seed(users=5, groups=2, posts=500, seed=5)
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        page = paginator.get_cursor_page()
+        seen = list(page)
+        while page.has_next():
+            page = paginator.get_cursor_page(after=page.next_cursor)
+            seen.extend(page)
+        self.assertEqual(len(seen), 500)
+        self.assertEqual(len({post.pk for post in seen}), 500)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT DISTINCT length(pub_date) FROM posts_post'
+            )
+            lengths = {length for length, in cursor.fetchall()}
+        self.assertLessEqual(lengths, {19, 26})
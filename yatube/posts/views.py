@@ -1,22 +1,38 @@
 # posts/views.py
+from urllib.parse import urlencode
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render, reverse
 
+from core.decorators import query_budget
+from core.replica import replica_reads
+
+from .conditional import (author_state, conditional_page, group_state,
+                          index_state, post_state)
+from .counters import stored_count, total_count
 from .forms import PostForm
-from .models import Group, Post
+from .group_cache import get_group_or_404
+from .models import Post
+from .page_cache import anonymous_page_cache
+from .paginators import CountedPaginator, legacy_page_url, paginate
+from .search import search_posts
 
 User = get_user_model()
 
 
 # Главная страница
+@query_budget(6)
+@replica_reads
+@anonymous_page_cache('index')
+@conditional_page(index_state)
 def index(request):
-    post_list = Post.objects.all()
-    paginator = Paginator(post_list, settings.PAGINATOR_VALUE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    post_list = Post.objects.for_feed()
+    redirect_url = legacy_page_url(request, post_list)
+    if redirect_url:
+        return redirect(redirect_url)
+    page_obj = paginate(request, post_list, total_count())
 
     title = 'Последние обновления на сайте'
     context = {
@@ -27,13 +43,18 @@ def index(request):
 
 
 # Cтраницы, на которых будут посты, отфильтрованные по группам
+@query_budget(7)
+@replica_reads
+@anonymous_page_cache('group', 'slug')
+@conditional_page(group_state)
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
+    group = get_group_or_404(slug)
 
-    post_list = group.group.all()
-    paginator = Paginator(post_list, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    post_list = group.group.for_feed()
+    redirect_url = legacy_page_url(request, post_list)
+    if redirect_url:
+        return redirect(redirect_url)
+    page_obj = paginate(request, post_list, stored_count(group))
 
     context = {
         'group': group,
@@ -43,12 +64,19 @@ def group_posts(request, slug):
 
 
 # Страницы пользователя
+@query_budget(7)
+@replica_reads
+@anonymous_page_cache('author', 'username')
+@conditional_page(author_state)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    post_list = author.posts.all()
-    paginator = Paginator(post_list, settings.PAGINATOR_VALUE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    author = get_object_or_404(
+        User.objects.select_related('post_stats'), username=username
+    )
+    post_list = author.posts.for_feed()
+    redirect_url = legacy_page_url(request, post_list)
+    if redirect_url:
+        return redirect(redirect_url)
+    page_obj = paginate(request, post_list, stored_count(author))
 
     context = {
         'author': author,
@@ -57,9 +85,28 @@ def profile(request, username):
     return render(request, 'posts/profile.html', context)
 
 
+# Поиск по постам
+@query_budget(4)
+def search(request):
+    query = request.GET.get('q', '').strip()
+    post_list = search_posts(Post.objects.for_feed(), query)
+    paginator = CountedPaginator(post_list, settings.PAGINATOR_VALUE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+
+    context = {
+        'page_obj': page_obj,
+        'query': query,
+        'page_query': urlencode({'q': query}) + '&',
+    }
+    return render(request, 'posts/search.html', context)
+
+
 # Страница записи
+@query_budget(4)
+@replica_reads
+@conditional_page(post_state)
 def post_detail(request, post_id):
-    post = Post.objects.get(id=post_id)
+    post = get_object_or_404(Post.objects.for_detail(), id=post_id)
     author = post.author
     title = post.text[:31]
     context = {
@@ -72,6 +119,7 @@ def post_detail(request, post_id):
 
 # Страницы создания поста
 @login_required
+@query_budget(12)
 def post_create(request):
     form = PostForm(request.POST or None)
     if form.is_valid():
@@ -88,8 +136,11 @@ def post_create(request):
 
 # Страница редактирования поста
 @login_required
+@query_budget(12)
 def post_edit(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author'), id=post_id
+    )
     author = post.author
     is_edit = True
     form = PostForm(request.POST or None, instance=post)
@@ -28,11 +28,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaPinMiddleware',
+    'core.middleware.ProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -67,8 +70,54 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    },
+    # Копия основной базы для чтения лент; её создаёт и обновляет
+    # manage.py refresh_replica. Пока файла нет, всё читается из default
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.replica.sqlite3'),
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+DATABASE_ROUTERS = ['core.replica.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+# Приложения, чьи модели ленты читают из реплики
+REPLICA_APPS = {'posts'}
+# Как часто refresh_replica обновляет копию и сколько секунд после
+# записи пользователь читает из основной базы; закрепление должно
+# быть дольше интервала обновления
+REPLICA_REFRESH_INTERVAL = 10
+REPLICA_PIN_SECONDS = 30
+
+# PRAGMA для каждого соединения с SQLite (core/sqlite.py): WAL не
+# блокирует читателей во время записи, synchronous=NORMAL в режиме WAL
+# безопасен и не ждёт fsync на каждой фиксации; кэш страниц 64 МиБ
+# (отрицательное значение — в КиБ), mmap 256 МиБ, ожидание блокировки 5 с
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64 * 1024,
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,
+}
+# Сколько раз повторять запрос, получивший «database is locked»
+SQLITE_BUSY_RETRIES = 5
+# Начинать транзакции с BEGIN IMMEDIATE
+SQLITE_IMMEDIATE_TRANSACTIONS = True
+
+# Поколения лент и кэш страниц должны быть общими для всех процессов:
+# при нескольких воркерах нужен Memcached или другой общий бэкенд
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
+# Кэш по умолчанию виден всем процессам сервера; с LocMemCache сдвиг
+# поколения лент в одном воркере не дошёл бы до остальных
+SHARED_CACHE = CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
 
 
 # Password validation
@@ -116,10 +165,76 @@ LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'users:logout'
 
 #  Эмуляция почтового сервера
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма ставятся в очередь (core/mail.py), а отправляет их
+# manage.py send_outbox через OUTBOX_EMAIL_BACKEND
+EMAIL_BACKEND = 'core.mail.OutboxBackend'
+OUTBOX_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_WORKERS = 4
+# Попыток на письмо; пауза перед повтором в секундах удваивается
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = 60
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+# Ход массовых действий админки пишется в консоль сервера
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'posts.bulk': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
 # Apps constants
 
 EMPTY_VALUE = '-пусто-'
 PAGINATOR_VALUE = 10
+# Сколько строк лента без счётчика считает точно; дальше пагинатор
+# переходит в режим «много страниц»
+FEED_COUNT_LIMIT = 1000
+# Сколько постов список в админке считает точно при фильтрах и поиске
+ADMIN_COUNT_LIMIT = 10000
+# По сколько постов действия админки меняют за одну транзакцию; не
+# больше 999 — столько параметров принимает запрос к старому SQLite
+BULK_UPDATE_CHUNK_SIZE = 500
+# Группы в памяти процесса (posts/group_cache.py). Об их изменениях
+# процессы узнают через общий кэш, а без него — по файлу-отметке
+# GROUP_CACHE_STAMP. Файл общий только для процессов одной машины:
+# воркерам на разных машинах нужен общий кэш (Memcached, Redis)
+GROUP_CACHE = True
+GROUP_CACHE_STAMP = os.path.join(BASE_DIR, 'tmp', 'groups.stamp')
+# Сколько групп и сколько несуществующих слагов
+# каждый процесс держит в памяти
+GROUP_CACHE_SIZE = 1000
+GROUP_CACHE_MISSING_SIZE = 1000
+# Пагинация лент: 'page' — по номеру страницы, 'cursor' — по курсору
+FEED_PAGINATION = 'page'
+# Проверять лимиты SQL-запросов, заданные декоратором query_budget
+QUERY_BUDGET_ENFORCE = DEBUG
+# Время жизни отрисованных карточек постов в кэше, секунды
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+# Кэш страниц лент для анонимных читателей; свежесть обеспечивают
+# поколения лент, поэтому время жизни большое. Без общего кэша
+# остальные воркеры отдавали бы устаревшие страницы до истечения срока
+FEED_PAGE_CACHE = not DEBUG and SHARED_CACHE
+FEED_PAGE_CACHE_TIMEOUT = 60 * 60
+# Насколько время view может превысить базовые замеры в
+# core/tests/baseline.json, прежде чем тест производительности упадёт
+PERF_BUDGET_MARGIN = 0.5
+# Тесты производительности (метка performance) в обычный прогон не
+# входят: manage.py test --tag performance
+TEST_RUNNER = 'core.runner.TestRunner'
+# Каталог, где процессы-воркеры хранят метрики для /metrics; без него
+# метрики копятся в памяти процесса и видны только ему
+METRICS_DIR = None
+# Журнал медленных запросов: порог в секундах (None отключает),
+# соединение и файл JSON lines с ротацией по размеру
+SLOW_QUERY_THRESHOLD = 0.1
+SLOW_QUERY_DATABASE = 'default'
+SLOW_QUERY_LOG = os.path.join(BASE_DIR, 'logs', 'slow_queries.jsonl')
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 5